@@ -0,0 +1,266 @@
+"""
+Benchmarks for the validation hot path.
+
+Runs `InputValidator` against a local stand-in session (no browser or server) and
+prints machine-readable JSON results:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --fields 10,300 --rules 1,4 --depth 0,3 --repeat 20
+
+Covered: building validators (`add_rule`/`add_validator`), full validation passes
+and single-input-change passes across fields x rules x nesting depth, every built-in
+`check` rule, and the size of the messages sent to the browser.
+"""
+
+import argparse
+import asyncio
+import importlib.metadata
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shiny import reactive  # noqa: E402
+from shiny.session import session_context  # noqa: E402
+
+from shiny_validate import InputValidator, check  # noqa: E402
+from shiny_validate._testing import RecordingSession, set_input  # noqa: E402
+
+
+def timings(fn: Callable, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "max_s": max(samples),
+        "repeat": repeat,
+    }
+
+
+async def atimings(fn: Callable, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "max_s": max(samples),
+        "repeat": repeat,
+    }
+
+
+def field_rules(n_rules: int) -> List[Callable]:
+    rules = [check.required(), check.regex("^[a-z]+$", "Lower-case letters only")]
+    rules += [check.in_set({"a", "b", "ok"}), lambda x: None if len(x) < 50 else "Too long"]
+    return [rules[i % len(rules)] for i in range(n_rules)]
+
+
+def build(
+    session: RecordingSession, n_fields: int, n_rules: int, depth: int, **kwargs
+):
+    """
+    Build a validator whose fields are split evenly over a chain of `depth` nested
+    child validators, each in its own module namespace.
+    """
+    levels = depth + 1
+    validators = []
+    scope = session
+    for level in range(levels):
+        if level:
+            scope = scope.make_scope(f"m{level}")
+        with session_context(scope):
+            iv = InputValidator(**kwargs)
+            for i in range(level, n_fields, levels):
+                name = f"f{i}"
+                set_input(scope, name, "ok")
+                for rule in field_rules(n_rules):
+                    iv.add_rule(name, rule)
+        validators.append((scope, iv))
+
+    for (_, parent), (_, child) in zip(validators, validators[1:]):
+        with session_context(session):
+            parent.add_validator(child)
+    return validators
+
+
+async def bench_validator(sizes: dict, repeat: int) -> List[dict]:
+    results = []
+    for n_fields in sizes["fields"]:
+        for n_rules in sizes["rules"]:
+            for depth in sizes["depth"]:
+                for per_field in (False, True):
+                    results.append(
+                        await bench_case(n_fields, n_rules, depth, per_field, repeat)
+                    )
+    return results
+
+
+async def bench_case(n_fields, n_rules, depth, per_field, repeat) -> dict:
+    session = RecordingSession("bench")
+
+    build_time = timings(
+        lambda: build(RecordingSession("bench"), n_fields, n_rules, depth), 1
+    )
+    validators = build(session, n_fields, n_rules, depth, per_field=per_field)
+    root = validators[0][1]
+
+    with session_context(session):
+        root.enable()
+    await reactive.flush()
+    initial = session.sent[-1][1] if session.sent else {}
+
+    def full_pass():
+        with reactive.isolate():
+            root.validate()
+
+    # One input changes per pass, alternating between a valid and an invalid value
+    scope, _ = validators[-1]
+    state = {"i": 0}
+
+    async def single_change():
+        state["i"] += 1
+        set_input(scope, f"f{depth}", "" if state["i"] % 2 else "ok")
+        await reactive.flush()
+
+    n_sent = len(session.sent)
+    change = await atimings(single_change, repeat)
+    deltas = [len(json.dumps(m)) for _, m in session.sent[n_sent:]]
+
+    return {
+        "benchmark": "validator",
+        "fields": n_fields,
+        "rules_per_field": n_rules,
+        "depth": depth,
+        "per_field": per_field,
+        "build": build_time,
+        "full_validate": timings(full_pass, repeat),
+        "single_change": change,
+        "payload_bytes": {
+            "initial": len(json.dumps(initial)),
+            "single_change_max": max(deltas, default=0),
+        },
+        "messages_per_change": len(deltas) / repeat,
+    }
+
+
+def check_cases() -> Dict[str, Tuple[Callable, list]]:
+    return {
+        "required": (check.required(), ["", "abc", None]),
+        "optional": (check.optional(), ["", "abc"]),
+        "regex": (check.regex("^[0-9]{5}$", "Zip code"), ["12345", "abcde"]),
+        "email": (check.email(), ["someone@example.com", "not an email"]),
+        "email_multiple": (
+            check.email(allow_multiple=True),
+            ["a@example.com, b@example.com", "a@example.com, nope"],
+        ),
+        "url": (check.url(), ["https://example.com/a?b=c", "not a url"]),
+        "integer": (check.integer(), [5, 5.5, ""]),
+        "between": (check.between(0, 10, [True, True]), [5, 50]),
+        "in_set_small": (check.in_set({"a", "b", "c"}), ["a", "z"]),
+        "in_set_large": (check.in_set({str(i) for i in range(100_000)}), ["99", "x"]),
+        "compose_rules": (
+            check.compose_rules(check.required(), check.email()),
+            ["", "someone@example.com"],
+        ),
+        "basic": (check.basic(False, False, False), [None, "Inf", "x"]),
+        "compare": (
+            check.compare(5, "Must be more than {rhs}", lambda a, b: a > b),
+            [1, 10],
+        ),
+        "gt": (check.gt(5), [1, 10]),
+        "gte": (check.gte(5), [1, 10]),
+        "lt": (check.lt(5), [1, 10]),
+        "lte": (check.lte(5), [1, 10]),
+        "equal": (check.equal(5), [5, 1]),
+        "not_equal": (check.not_equal(5), [5, 1]),
+    }
+
+
+def bench_checks(calls: int) -> List[dict]:
+    results = []
+    for name, (rule, values) in check_cases().items():
+        if not callable(rule):
+            results.append({"benchmark": "check", "check": name, "error": "not callable"})
+            continue
+        for value in values:
+
+            def run(rule=rule, value=value):
+                for _ in range(calls):
+                    try:
+                        rule(value)
+                    except Exception:
+                        pass
+
+            timing = timings(run, 5)
+            results.append(
+                {
+                    "benchmark": "check",
+                    "check": name,
+                    "value": repr(value),
+                    "calls": calls,
+                    "per_call_s": timing["min_s"] / calls,
+                }
+            )
+
+    factory = timings(lambda: [check.email() for _ in range(calls)], 5)
+    results.append(
+        {
+            "benchmark": "check_factory",
+            "check": "email",
+            "calls": calls,
+            "per_call_s": factory["min_s"] / calls,
+        }
+    )
+    return results
+
+
+def package_version() -> Optional[str]:
+    # None when running from a checkout that isn't installed
+    try:
+        return importlib.metadata.version("shiny_validate")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def parse_sizes(value: str) -> List[int]:
+    return [int(x) for x in value.split(",") if x]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=parse_sizes, default=[10, 100, 300])
+    parser.add_argument("--rules", type=parse_sizes, default=[1, 4])
+    parser.add_argument("--depth", type=parse_sizes, default=[0, 3])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--check-calls", type=int, default=10_000)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    sizes = {"fields": args.fields, "rules": args.rules, "depth": args.depth}
+    report = {
+        "python": platform.python_version(),
+        "shiny_validate": package_version(),
+        "results": asyncio.run(bench_validator(sizes, args.repeat))
+        + bench_checks(args.check_calls),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 from .validator import InputValidator
 from . import check
-from .deps import html_deps
+from .deps import html_deps, include_html_deps
+from .executor import ExecutorBusy, RuleExecutor
+from .batch import BatchResult, validate_columns
+from .engine import ValidationEngine
+from .metrics import ValidationMetrics
+from .rule_cache import RuleCache
 
 __all__ = [
     "check",
     "InputValidator",
     "html_deps",
+    "include_html_deps",
+    "RuleExecutor",
+    "ExecutorBusy",
+    "BatchResult",
+    "validate_columns",
+    "ValidationEngine",
+    "ValidationMetrics",
+    "RuleCache",
 ]
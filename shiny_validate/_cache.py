@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded mapping that evicts the least recently used entry.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of entries to keep.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1")
+        self.__maxsize: int = maxsize
+        self.__data: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1")
+        with self.__lock:
+            self.__maxsize = maxsize
+            self.__evict()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            try:
+                value = self.__data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            self.__evict()
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the value stored under `key`, computing and storing it with
+        `factory()` on a miss.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            return self.__data.pop(key, default)
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__data),
+            "maxsize": self.__maxsize,
+        }
+
+    def __evict(self):
+        while len(self.__data) > self.__maxsize:
+            self.__data.popitem(last=False)
+
+
+def memo_key(value):
+    # Rule results are memoized by value, so the value must be hashable. Lists and
+    # dicts are frozen; the type is part of the key so that 1, 1.0 and True differ.
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(memo_key(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, tuple((k, memo_key(v)) for k, v in value.items()))
+    hash(value)
+    return (type(value), value)
@@ -0,0 +1,108 @@
+"""
+Column-at-a-time versions of the built-in checks, used by `validate_columns()`.
+
+Each kernel takes a check's spec and a NumPy array of values and returns a boolean
+mask of the failing rows, or None when the column has to be checked row by row.
+This module needs NumPy and is only imported when it is installed.
+"""
+
+import numbers
+import re
+
+import numpy as np
+
+from .check._check import compile_pattern, email_pattern, url_pattern
+
+
+def required_kernel(spec, values):
+    kind = values.dtype.kind
+    if kind == "f":
+        return np.isnan(values)
+    if kind in "iub":
+        return np.zeros(len(values), dtype=bool)
+    if kind in "US":
+        return values == values.dtype.type()
+    # Same as `input_provided`, plus NaN cells: None, "" and NaN are missing
+    return np.fromiter(
+        (v is None or v == "" or v != v for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+
+
+def between_kernel(spec, values):
+    if values.dtype.kind not in "iuf":
+        return None
+    left, right = spec["left"], spec["right"]
+    inclusive = spec["inclusive"]
+    below = values < left if inclusive[0] else values <= left
+    above = values > right if inclusive[1] else values >= right
+    return below | above
+
+
+def in_set_kernel(spec, values):
+    allowed = spec["values"]
+    try:
+        # `np.isin` compares in one common dtype, so a set mixing numbers with
+        # other values would turn everything into strings
+        if values.dtype.kind in "iufb" and all(
+            isinstance(v, numbers.Number) for v in allowed
+        ):
+            return ~np.isin(values, list(allowed))
+        return np.fromiter(
+            (v not in allowed for v in values), dtype=bool, count=len(values)
+        )
+    except TypeError:
+        return None
+
+
+def pattern_kernel(compiled: re.Pattern, values, allow_none: bool = False):
+    if values.dtype.kind != "O":
+        return None
+    if not all(isinstance(v, str) or (allow_none and v is None) for v in values):
+        return None
+    search = compiled.search
+    return np.fromiter(
+        (v is not None and search(v) is None for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+
+
+def regex_kernel(spec, values):
+    flags = re.IGNORECASE if spec["ignore_case"] else 0
+    return pattern_kernel(compile_pattern(spec["pattern"], flags), values)
+
+
+def email_kernel(spec, values):
+    if spec["allow_multiple"]:
+        return None
+    compiled = compile_pattern(email_pattern, re.IGNORECASE)
+    return pattern_kernel(compiled, values, spec["allow_none"])
+
+
+def url_kernel(spec, values):
+    if spec["allow_multiple"]:
+        return None
+    compiled = compile_pattern(url_pattern, re.IGNORECASE)
+    return pattern_kernel(compiled, values, spec["allow_none"])
+
+
+def integer_kernel(spec, values):
+    kind = values.dtype.kind
+    if kind in "iub":
+        return np.zeros(len(values), dtype=bool)
+    if kind == "f":
+        return np.ones(len(values), dtype=bool)
+    return None
+
+
+kernels = {
+    "required": required_kernel,
+    "between": between_kernel,
+    "in_set": in_set_kernel,
+    "regex": regex_kernel,
+    "email": email_kernel,
+    "url": url_kernel,
+    "integer": integer_kernel,
+}
@@ -0,0 +1,126 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List
+
+from shiny import reactive
+
+
+class RateLimited(ABC):
+    """
+    A reactive reader whose value only updates at a limited rate.
+
+    Parameters
+    ----------
+    fn : function
+        The reactive function to rate limit, for example an input's reader.
+    millis : int
+        The debounce or throttle window in milliseconds.
+    priority : int
+        The priority of the validator using the value. The helper observers run
+        just before it so that it sees the settled value in the same flush.
+    """
+
+    def __init__(self, fn: Callable, millis: int, priority: int):
+        if millis < 0:
+            raise ValueError("`millis` must not be negative")
+        self.delay: float = millis / 1000
+        self.cached = reactive.Calc(fn)
+        self.effects: List[reactive.Effect_] = []
+        self.value: reactive.Calc_ = self._build(priority)
+
+    def __call__(self):
+        return self.value()
+
+    @abstractmethod
+    def _build(self, priority: int) -> reactive.Calc_:
+        """
+        Create the helper observers, store them in `self.effects`, and return the
+        rate-limited reader of `self.cached`.
+        """
+
+    def destroy(self):
+        for effect in self.effects:
+            effect.destroy()
+        self.effects = []
+
+
+class Debounced(RateLimited):
+    """
+    Only update once the wrapped value has stopped changing for `millis`.
+    """
+
+    def _build(self, priority: int) -> reactive.Calc_:
+        when = reactive.Value(None)
+        trigger = reactive.Value(0)
+
+        @reactive.Effect(priority=priority + 2)
+        def primer():
+            try:
+                self.cached()
+            except Exception:
+                pass
+            finally:
+                when.set(time.time() + self.delay)
+
+        @reactive.Effect(priority=priority + 1)
+        def timer():
+            deadline = when()
+            if deadline is None:
+                return
+            time_left = deadline - time.time()
+            if time_left <= 0:
+                with reactive.isolate():
+                    when.set(None)
+                    trigger.set(trigger.get() + 1)
+            else:
+                reactive.invalidate_later(time_left)
+
+        self.effects = [primer, timer]
+
+        @reactive.Calc
+        @reactive.event(trigger, ignore_none=False)
+        def debounced():
+            return self.cached()
+
+        return debounced
+
+
+class Throttled(RateLimited):
+    """
+    Update at most once every `millis`, on the leading and trailing edge.
+    """
+
+    def _build(self, priority: int) -> reactive.Calc_:
+        last_triggered = reactive.Value(None)
+        pending = reactive.Value(False)
+
+        @reactive.Effect(priority=priority + 2)
+        def primer():
+            try:
+                self.cached()
+            except Exception:
+                pass
+            finally:
+                pending.set(True)
+
+        @reactive.Effect(priority=priority + 1)
+        def timer():
+            if not pending():
+                return
+            now = time.time()
+            with reactive.isolate():
+                last = last_triggered.get()
+            if last is None or now - last >= self.delay:
+                last_triggered.set(now)
+                pending.set(False)
+            else:
+                reactive.invalidate_later(self.delay - (now - last))
+
+        self.effects = [primer, timer]
+
+        @reactive.Calc
+        @reactive.event(last_triggered, ignore_none=False)
+        def throttled():
+            return self.cached()
+
+        return throttled
@@ -0,0 +1,55 @@
+from typing import List, Tuple
+
+from shiny import reactive
+from shiny.express._stub_session import ExpressStubSession
+from shiny.module import ResolvedId
+from shiny.session._session import SessionProxy
+from shiny.session._utils import RenderedDeps
+
+
+class RecordingSession(ExpressStubSession):
+    """
+    A stand-in session that records the custom messages sent to the browser instead
+    of sending them, so validators can be enabled and flushed without a running app.
+    Used by the tests and the benchmarks.
+    """
+
+    def __init__(self, id: str = "test"):
+        super().__init__(ResolvedId(""))
+        self.id = id
+        self.sent: List[Tuple[str, dict]] = []
+
+    async def send_custom_message(self, type: str, message: dict):
+        self.sent.append((type, message))
+
+    def _send_insert_ui(self, *args, **kwargs):
+        pass
+
+    def _process_ui(self, ui) -> RenderedDeps:
+        return {"deps": [], "html": ""}
+
+    # Validators do nothing in a stub session
+    def is_stub_session(self):  # pyright: ignore[reportIncompatibleMethodOverride]
+        return False
+
+    def root_scope(self):
+        return self
+
+    def make_scope(self, id: str):
+        return SessionProxy(self, self.ns(id))
+
+    def results(self) -> dict:
+        """
+        The validation state shown in the browser, from the messages sent so far.
+        """
+        shown = {}
+        for type, message in self.sent:
+            if type == "validation-jcheng5":
+                shown.update(message)
+        return {k: v for k, v in shown.items() if v is not None}
+
+
+def set_input(scope, name: str, value):
+    # `scope` is the stand-in session or a module scope of it
+    with reactive.isolate():
+        scope.input[name]._set(value)
@@ -0,0 +1,88 @@
+import base64
+import itertools
+from typing import Dict, List
+
+# The value of the "shinyvalidate_client" input from browsers that decode
+# "validation-compact-jcheng5" messages
+compact_client_version = 2
+
+# A stream's tables are reset once they hold this many messages, so that
+# messages containing the input's value can't grow them without bound
+max_messages = 4096
+
+stream_ids = itertools.count(1)
+
+
+class CompactEncoder:
+    """
+    Encodes validation changes as "validation-compact-jcheng5" messages.
+
+    Each encoder is a stream with its own tables of id prefixes (module
+    namespaces), field ids and messages, which the browser keeps until the stream
+    is reset. Each prefix, field and message is sent once and then referred to by
+    its index: errors are a flat list of (field, message) index pairs, and cleared
+    fields a base64 bitset of field indexes.
+    """
+
+    def __init__(self):
+        self.stream: int = next(stream_ids)
+        self.__reset()
+
+    def encode(self, changes: dict) -> dict:
+        if len(self.__messages) > max_messages:
+            self.__reset()
+
+        new_prefixes = []
+        new_fields = []
+        new_messages = []
+        errors = []
+        cleared = []
+        for fullname, result in changes.items():
+            field = self.__fields.get(fullname)
+            if field is None:
+                cut = fullname.rfind("-") + 1
+                prefix = self.__prefixes.get(fullname[:cut])
+                if prefix is None:
+                    prefix = self.__prefixes[fullname[:cut]] = len(self.__prefixes)
+                    new_prefixes.append(fullname[:cut])
+                field = self.__fields[fullname] = len(self.__fields)
+                new_fields.extend((prefix, fullname[cut:]))
+            if result is None:
+                cleared.append(field)
+                continue
+            key = (result["type"], result["message"], result["is_html"])
+            message = self.__messages.get(key)
+            if message is None:
+                message = self.__messages[key] = len(self.__messages)
+                new_messages.append(list(key))
+            errors.extend((field, message))
+
+        encoded = {"s": self.stream}
+        if self.__new:
+            encoded["r"] = 1
+            self.__new = False
+        if new_prefixes:
+            encoded["p"] = new_prefixes
+        if new_fields:
+            encoded["f"] = new_fields
+        if new_messages:
+            encoded["m"] = new_messages
+        if errors:
+            encoded["e"] = errors
+        if cleared:
+            encoded["c"] = bitset(cleared)
+        return encoded
+
+    def __reset(self):
+        self.__prefixes: Dict[str, int] = {}
+        self.__fields: Dict[str, int] = {}
+        self.__messages: Dict[tuple, int] = {}
+        # The next message tells the browser to drop the stream's tables
+        self.__new: bool = True
+
+
+def bitset(indexes: List[int]) -> str:
+    bits = bytearray(max(indexes) // 8 + 1)
+    for i in indexes:
+        bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bits).decode("ascii")
@@ -0,0 +1,229 @@
+import inspect
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    kernels = {}
+else:
+    from ._kernels import kernels
+
+Rules = Union[Callable, Sequence[Callable]]
+
+
+class BatchResult:
+    """
+    The result of validating a table of values with `validate_columns()`.
+
+    Attributes
+    ----------
+    n_rows : int
+        The number of rows that were validated.
+    errors : dict[str, list]
+        For each validated column, the error message of every row, or None for rows
+        that passed all of the column's rules.
+    counts : dict[str, int]
+        For each validated column, the number of rows that failed.
+    """
+
+    def __init__(self, n_rows: int, errors: dict, counts: dict, invalid: list):
+        self.n_rows: int = n_rows
+        self.errors: Dict[str, List[Optional[str]]] = errors
+        self.counts: Dict[str, int] = counts
+        self.__invalid = invalid
+
+    def is_valid(self) -> bool:
+        return not any(self.counts.values())
+
+    def invalid_rows(self) -> List[int]:
+        """
+        The indices of the rows with at least one error.
+        """
+        return list(self.__invalid)
+
+    def row_errors(self, row: int) -> Dict[str, str]:
+        """
+        The error messages of one row, by column.
+        """
+        errors = {}
+        for col, msgs in self.errors.items():
+            msg = msgs[row]
+            if msg is not None:
+                errors[col] = msg
+        return errors
+
+    def summary(self) -> dict:
+        return {
+            "rows": self.n_rows,
+            "invalid_rows": len(self.__invalid),
+            "errors": dict(self.counts),
+        }
+
+
+def validate_columns(data: Mapping, rules: Mapping[str, Rules]) -> BatchResult:
+    """
+    Validate whole columns of tabular data with the same rules used for inputs.
+
+    Each column's rules run in order and the first failing rule gives the row's
+    message, just like `InputValidator`. Built-in checks (`check.required`,
+    `check.between`, `check.in_set`, `check.regex`, `check.email`, `check.url` and
+    `check.integer`) are evaluated on the whole column at once when NumPy is
+    installed; any other rule is called once per row that is still undecided.
+
+    Parameters
+    ----------
+    data : Mapping
+        The table to validate: a dict of lists or NumPy arrays, or a pandas DataFrame.
+    rules : Mapping[str, function or list of functions]
+        The rules for each column to validate.
+
+    Returns
+    -------
+    BatchResult
+        Per-row error messages and per-column error counts.
+
+    Note
+    ----
+    Missing cells (None or NaN) count as not provided for `check.required`.
+    """
+    errors = {}
+    counts = {}
+    invalid = None
+    n_rows = None
+    for col, col_rules in rules.items():
+        if callable(col_rules):
+            col_rules = [col_rules]
+        values = as_column(data[col])
+        if n_rows is None:
+            n_rows = len(values)
+        elif len(values) != n_rows:
+            raise ValueError(f"Column '{col}' does not have {n_rows} rows")
+
+        if np is None:
+            messages = validate_rows(values, col_rules)
+            failed = [msg is not None for msg in messages]
+            counts[col] = sum(failed)
+            if invalid is not None:
+                failed = list(map(any, zip(invalid, failed)))
+            invalid = failed
+            errors[col] = messages
+        else:
+            messages = validate_column(values, col_rules)
+            failed = np.fromiter(
+                (msg is not None for msg in messages), dtype=bool, count=len(messages)
+            )
+            invalid = failed if invalid is None else invalid | failed
+            counts[col] = int(failed.sum())
+            errors[col] = messages.tolist()
+
+    if invalid is None:
+        invalid_rows = []
+    elif np is None:
+        invalid_rows = [i for i, bad in enumerate(invalid) if bad]
+    else:
+        invalid_rows = np.flatnonzero(invalid).tolist()
+    return BatchResult(n_rows or 0, errors, counts, invalid_rows)
+
+
+def validate_rows(values, rules: Sequence[Callable]) -> List[Optional[str]]:
+    """
+    Apply a rule chain to one column row by row, returning each row's first error or
+    None.
+    """
+    messages: List[Optional[str]] = [None] * len(values)
+    undecided = list(range(len(values)))
+    for rule in rules:
+        undecided = [
+            i for i in undecided if not apply_scalar(rule, values[i], messages, i)
+        ]
+    return messages
+
+
+def validate_column(values, rules: Sequence[Callable]):
+    """
+    Apply a rule chain to one column held in a NumPy array, returning each row's
+    first error or None as an object array.
+    """
+    assert np is not None
+    messages = np.full(len(values), None, dtype=object)
+    undecided = np.arange(len(values))
+    for rule in rules:
+        if len(undecided) == 0:
+            break
+        sub = values[undecided]
+        spec = getattr(rule, "check_spec", None)
+        failed = vectorized(spec, sub)
+        if failed is not None and spec is not None:
+            messages[undecided[failed]] = spec["message"]
+            undecided = undecided[~failed]
+        else:
+            # `tolist()` hands rules Python values rather than NumPy scalars
+            decided = np.fromiter(
+                (
+                    apply_scalar(rule, value, messages, i)
+                    for value, i in zip(sub.tolist(), undecided.tolist())
+                ),
+                dtype=bool,
+                count=len(undecided),
+            )
+            undecided = undecided[~decided]
+    return messages
+
+
+def apply_scalar(rule: Callable, value, messages, i: int) -> bool:
+    # Returns True when the row is decided, i.e. the rule failed or skipped the rest
+    # of the chain; failures are written into `messages`.
+    spec = getattr(rule, "check_spec", None)
+    if spec is not None and spec["name"] == "required" and is_nan(value):
+        messages[i] = spec["message"]
+        return True
+    try:
+        result = rule(value)
+    except Exception as e:
+        result = "An unexpected error occurred during input validation: " + str(e)
+    if result is None:
+        return False
+    if inspect.isawaitable(result):
+        if inspect.iscoroutine(result):
+            result.close()
+        raise ValueError("Async rules can't be used with `validate_columns()`")
+    if isinstance(result, (str, bytes)):
+        messages[i] = str(result)
+    return True
+
+
+def is_nan(value) -> bool:
+    return isinstance(value, float) and value != value
+
+
+def as_column(values):
+    if np is None:
+        return list(values)
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy()
+    if isinstance(values, np.ndarray):
+        return values
+
+    values = list(values)
+    # Only homogeneous lists become typed arrays, so that every row keeps the
+    # Python type a form input would have
+    types = set(map(type, values))
+    if len(types) == 1 and types.pop() in (int, float, bool):
+        arr = np.asarray(values)
+        if arr.dtype.kind in "iufb":
+            return arr
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def vectorized(spec: Optional[dict], values):
+    # Returns a boolean mask of failing rows, or None if the rule has to be called
+    # per row
+    if spec is None:
+        return None
+    kernel = kernels.get(spec["name"])
+    if kernel is None:
+        return None
+    return kernel(spec, values)
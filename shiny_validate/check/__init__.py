@@ -4,6 +4,7 @@ from ._check import (
     compose_rules,
     email,
     in_set,
+    in_index,
     optional,
     required,
     url,
@@ -16,7 +17,11 @@ from ._check import (
     lte,
     equal,
     not_equal,
+    compile_pattern,
+    pattern_cache,
 )
+from ._index import ValueIndex
+from ._lookup import lookup
 
 __all__ = [
     "basic",
@@ -24,6 +29,9 @@ __all__ = [
     "compose_rules",
     "email",
     "in_set",
+    "in_index",
+    "ValueIndex",
+    "lookup",
     "optional",
     "required",
     "url",
@@ -36,4 +44,6 @@ __all__ = [
     "lte",
     "equal",
     "not_equal",
+    "compile_pattern",
+    "pattern_cache",
 ]
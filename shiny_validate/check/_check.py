@@ -1,10 +1,193 @@
-from typing import Callable
+import math
+import re
+from itertools import islice
+from typing import Callable, List, Optional, Union
+
+from .._cache import LRUCache
+from ._index import ValueIndex
 
 err_msg_zero_length_value = "Must not contain zero values."
 err_msg_allow_multiple = "Must not contain multiple values."
 err_msg_allow_none = "Value must not be 'None'"
 err_msg_allow_infinite = "Must not contain infinite values."
 
+# Regular expression taken from
+# https://www.nicebread.de/validating-email-adresses-in-r/
+email_pattern = "^\\s*[A-Z0-9._%&'*+`/=?^{}~-]+@[A-Z0-9.-]+\\.[A-Z0-9]{2,}\\s*$"
+
+# Regular expression taken from
+# https://gist.github.com/dperini/729294
+url_pattern = "^(?:(?:http(?:s)?|ftp)://)(?:\\S+(?::(?:\\S)*)?@)?(?:(?:[a-z0-9\u00a1-\uffff](?:-)*)*(?:[a-z0-9\u00a1-\uffff])+)(?:\\.(?:[a-z0-9\u00a1-\uffff](?:-)*)*(?:[a-z0-9\u00a1-\uffff])+)*(?:\\.(?:[a-z0-9\u00a1-\uffff]){2,})(?::(?:\\d){2,5})?(?:/(?:\\S)*)?$"
+
+# Compiled patterns are shared by every rule in the process, so a pattern is
+# compiled once per server rather than once per call or per session.
+pattern_cache = LRUCache(maxsize=256)
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Compile a regex pattern, reusing the process-wide compiled-pattern cache.
+
+    Parameters
+    ----------
+    pattern : str
+        The regex pattern to compile.
+    flags : int, optional
+        Flags passed to `re.compile`, by default 0.
+
+    Returns
+    -------
+    re.Pattern
+        The compiled pattern. Cache hits and misses are counted in `pattern_cache`.
+    """
+    return pattern_cache.get_or_set(
+        (pattern, flags), lambda: re.compile(pattern, flags)
+    )
+
+
+def with_spec(fn: Callable, name: str, **params) -> Callable:
+    """
+    Describe a built-in rule so that it can be evaluated without calling it, for
+    example by the vectorized batch validator.
+
+    Parameters
+    ----------
+    fn : function
+        The rule function returned by a check factory.
+    name : str
+        The name of the check, such as "between".
+    **params
+        The check's parameters, including the error `message` it returns.
+
+    Returns
+    -------
+    function
+        `fn`, with the description stored in its `check_spec` attribute.
+    """
+    fn.check_spec = {"name": name, **params}
+    return fn
+
+
+# Checks that the browser evaluates exactly like the server does. The pattern
+# checks are mirrored as well, but JavaScript and Python regexes can disagree on
+# edge cases, so the server keeps sending their results.
+exact_client_checks = frozenset(
+    {
+        "required",
+        "integer",
+        "between",
+        "in_set",
+        "gt",
+        "gte",
+        "lt",
+        "lte",
+        "equal",
+        "not_equal",
+    }
+)
+
+# Larger sets are only checked on the server
+client_set_limit = 1000
+
+
+def client_spec(fn: Callable) -> Optional[dict]:
+    """
+    The JSON-serializable description of a built-in rule that the browser can
+    evaluate as the user types.
+
+    Parameters
+    ----------
+    fn : function
+        A validation rule.
+
+    Returns
+    -------
+    dict or None
+        The rule's `check_spec` plus anything the browser needs to evaluate it, or
+        None if the rule can only run on the server.
+    """
+    spec = getattr(fn, "check_spec", None)
+    if spec is None:
+        return None
+    name = spec["name"]
+    if name in ("email", "url"):
+        pattern = email_pattern if name == "email" else url_pattern
+        return {**spec, "name": "pattern", "pattern": pattern, "ignore_case": True}
+    if name == "regex":
+        return {
+            **spec,
+            "name": "pattern",
+            "allow_multiple": False,
+            "allow_none": False,
+        }
+    if name == "integer":
+        return {
+            **spec,
+            "none_message": err_msg_allow_none,
+            "zero_length_message": err_msg_zero_length_value,
+        }
+    if name == "between":
+        if not (is_number(spec["left"]) and is_number(spec["right"])):
+            return None
+        return dict(spec)
+    if name == "in_set":
+        if len(spec["values"]) > client_set_limit:
+            return None
+        values = list(spec["values"])
+        if not (
+            all(isinstance(v, str) for v in values) or all(map(is_number, values))
+        ):
+            return None
+        return {**spec, "values": values}
+    if name in ("gt", "gte", "lt", "lte", "equal", "not_equal"):
+        if not is_number(spec["rhs"]):
+            return None
+        return {**spec, "none_message": err_msg_allow_none}
+    if name == "required":
+        return dict(spec)
+    return None
+
+
+def client_decides_value(spec: Optional[dict], value) -> bool:
+    """
+    Whether the browser reaches a verdict for `value` with a rule mirrored from
+    `client_spec()`. For other values its mirror gives up and the browser keeps
+    showing the server's last result, so the server must keep sending it.
+
+    Parameters
+    ----------
+    spec : dict or None
+        The rule's client description.
+    value : any
+        The input value.
+
+    Returns
+    -------
+    bool
+        True if the browser evaluates the rule for `value` exactly like the server.
+    """
+    if spec is None or spec["name"] not in exact_client_checks:
+        return False
+    # Lists and dicts (e.g. from multiple selections) compare differently in
+    # JavaScript, where the mirrors only handle scalars
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        return False
+    numeric = isinstance(value, (int, float))
+    if spec["name"] == "between":
+        return numeric
+    if spec["name"] in ("gt", "gte", "lt", "lte"):
+        return value is None or numeric
+    return True
+
+
+def is_number(value) -> bool:
+    # Numbers that survive the trip to JavaScript unchanged
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
 
 def check_input_length(
     input: any,
@@ -59,6 +242,8 @@ def required(message: str = "Required", test: Callable = input_provided):
         if not test(value):
             return message
 
+    if test is input_provided:
+        return with_spec(inner, "required", message=message)
     return inner
 
 
@@ -111,15 +296,16 @@ def regex(pattern: str, message: str, ignore_case: bool = False):
     function
         A function that takes an input value and returns the error message if the input value does not match the pattern.
     """
-    import re
-
     flags = re.IGNORECASE if ignore_case else 0
+    compiled = compile_pattern(pattern, flags)
 
     def inner(value: str):
-        if not re.search(pattern, value, flags=flags):
+        if not compiled.search(value):
             return message
 
-    return inner
+    return with_spec(
+        inner, "regex", pattern=pattern, ignore_case=ignore_case, message=message
+    )
 
 
 def email(
@@ -144,27 +330,28 @@ def email(
     function
         A function that takes an input value and returns the error message if the input value is not a valid email address.
     """
-    import re
+    compiled = compile_pattern(email_pattern, re.IGNORECASE)
 
     def inner(value: str):
-        # Regular expression taken from
-        # https://www.nicebread.de/validating-email-adresses-in-r/
-        pattern = "^\\s*[A-Z0-9._%&'*+`/=?^{}~-]+@[A-Z0-9.-]+\\.[A-Z0-9]{2,}\\s*$"
-        flags = re.IGNORECASE
-
         if allow_none and value is None:
             return
 
         if allow_multiple:
             emails = value.split(",")
             for email in emails:
-                if not re.search(pattern, email.strip(), flags=flags):
+                if not compiled.search(email.strip()):
                     return message
         else:
-            if not re.search(pattern, value, flags=flags):
+            if not compiled.search(value):
                 return message
 
-    return inner
+    return with_spec(
+        inner,
+        "email",
+        allow_multiple=allow_multiple,
+        allow_none=allow_none,
+        message=message,
+    )
 
 
 def url(
@@ -189,27 +376,28 @@ def url(
     function
         A function that takes an input value and returns the error message if the input value is not a valid URL.
     """
-    import re
+    compiled = compile_pattern(url_pattern, re.IGNORECASE)
 
     def inner(value: str):
-        # Regular expression taken from
-        # https://gist.github.com/dperini/729294
-        pattern = "^(?:(?:http(?:s)?|ftp)://)(?:\\S+(?::(?:\\S)*)?@)?(?:(?:[a-z0-9\u00a1-\uffff](?:-)*)*(?:[a-z0-9\u00a1-\uffff])+)(?:\\.(?:[a-z0-9\u00a1-\uffff](?:-)*)*(?:[a-z0-9\u00a1-\uffff])+)*(?:\\.(?:[a-z0-9\u00a1-\uffff]){2,})(?::(?:\\d){2,5})?(?:/(?:\\S)*)?$"
-        flags = re.IGNORECASE
-
         if allow_none and value is None:
             return
 
         if allow_multiple:
             urls = value.split(",")
             for url in urls:
-                if not re.search(pattern, url.strip(), flags=flags):
+                if not compiled.search(url.strip()):
                     return message
         else:
-            if not re.search(pattern, value, flags=flags):
+            if not compiled.search(value):
                 return message
 
-    return inner
+    return with_spec(
+        inner,
+        "url",
+        allow_multiple=allow_multiple,
+        allow_none=allow_none,
+        message=message,
+    )
 
 
 def compose_rules(*args):
@@ -290,23 +478,25 @@ def integer(
         A function that takes an input value and returns the error message if the input value is not an integer.
     """
 
-    def inner(value: str):
-        if len(value) == 0:
-            return err_msg_zero_length_value
+    def inner(value):
+        if value is None:
+            if not allow_none:
+                return err_msg_allow_none
+            return
 
-        if not allow_none and value is None:
-            return err_msg_allow_none
+        if isinstance(value, (str, list, tuple)) and len(value) == 0:
+            return err_msg_zero_length_value
 
         if not isinstance(value, int):
             return message
 
-    return inner
+    return with_spec(inner, "integer", allow_none=allow_none, message=message)
 
 
 def between(
     left: float,
     right: float,
-    inclusive: list[bool],
+    inclusive: List[bool],
     message_fmt: str = "Must be between {left} and {right}.",
     allow_none: bool = False,
 ):
@@ -353,16 +543,24 @@ def between(
         if l_of_left or l_or_right:
             return message
 
-    return inner
+    return with_spec(
+        inner,
+        "between",
+        left=left,
+        right=right,
+        inclusive=list(inclusive),
+        allow_none=allow_none,
+        message=message,
+    )
 
 
-def prepare_values_text(set: set, limit: int) -> str:
+def prepare_values_text(set: Union[set, ValueIndex], limit: int) -> str:
     """
     Prepare a string representation of a set of values.
 
     Parameters
     ----------
-    set : set
+    set : set or ValueIndex
         The set of values to represent as a string.
     limit : int
         The maximum number of values to include in the string. If the number of values in the set exceeds this limit, the string will indicate the number of omitted values.
@@ -375,7 +573,7 @@ def prepare_values_text(set: set, limit: int) -> str:
     if limit is not None and len(set) > limit:
         num_omitted = len(set) - limit
 
-        values_str = ", ".join(str(i) for i in list(set)[:limit])
+        values_str = ", ".join(str(i) for i in islice(set, limit))
 
         additional_text = f"(and {num_omitted} more)"
 
@@ -416,7 +614,47 @@ def in_set(
         if value not in set:
             return message
 
-    return inner
+    return with_spec(inner, "in_set", values=set, message=message)
+
+
+def in_index(
+    index: ValueIndex,
+    message_fmt: str = "Must be in the set of {values_text}.",
+    set_limit=3,
+):
+    """
+    Generate a validation function that checks if the input value is in a `ValueIndex`.
+
+    Like `in_set`, but for very large sets of strings: the index is memory-mapped and
+    shared by every session, lookups are a binary search, and the message only reads
+    the first `set_limit` values.
+
+    Parameters
+    ----------
+    index : ValueIndex
+        The index to check against, for example from `ValueIndex.open()`.
+    message_fmt : str
+        The error message to return if the input value is not in the index.
+    set_limit : int
+        The maximum number of values to include in the error message. If the number of values in the index exceeds this limit, the error message will indicate the number of omitted values.
+
+    Returns
+    -------
+    function
+        A function that takes an input value and returns the error message if the input value is not in the index.
+    """
+    if not isinstance(index, ValueIndex):
+        raise ValueError("`index` must be a ValueIndex")
+
+    values_text = prepare_values_text(index, limit=set_limit)
+
+    message = message_fmt.format(values_text=values_text)
+
+    def inner(value):
+        if value not in index:
+            return message
+
+    return with_spec(inner, "in_index", index=index, message=message)
 
 
 def compare(
@@ -449,8 +687,10 @@ def compare(
 
     # Testing of `value` and validation
     def inner(value):
-        if not allow_none and value is None:
-            return err_msg_allow_none
+        if value is None:
+            if not allow_none:
+                return err_msg_allow_none
+            return
 
         res = operator(value, rhs)
 
@@ -478,16 +718,9 @@ def gt(rhs: float, allow_none: bool = False, message_fmt="Must be greater than {
     function
         A function that takes an input value and returns the error message if the input value is not greater than the given value.
     """
-
-    def inner(value):
-        compare(
-            rhs=rhs,
-            message_fmt=message_fmt,
-            allow_none=allow_none,
-            operator=lambda value, rhs: value > rhs,
-        )
-
-    return inner
+    return compare_spec(
+        "gt", rhs, message_fmt, allow_none, lambda value, rhs: value > rhs
+    )
 
 
 def gte(
@@ -512,16 +745,9 @@ def gte(
     function
         A function that takes an input value and returns the error message if the input value is not greater than or equal to the given value.
     """
-
-    def inner(value):
-        compare(
-            rhs=rhs,
-            message_fmt=message_fmt,
-            allow_none=allow_none,
-            operator=lambda value, rhs: value >= rhs,
-        )
-
-    return inner
+    return compare_spec(
+        "gte", rhs, message_fmt, allow_none, lambda value, rhs: value >= rhs
+    )
 
 
 def lt(rhs: float, allow_none: bool = False, message_fmt="Must be less than {rhs}."):
@@ -533,31 +759,18 @@ def lt(rhs: float, allow_none: bool = False, message_fmt="Must be less than {rhs
     rhs : float
         The value to compare with.
     allow_none : bool
-    def inner(value):
-        compare(
-            rhs=rhs,
-            message_fmt=message_fmt,
-            allow_none=allow_none,
-            operator=lambda value, rhs: value < rhs,
-        )
+        If False, the input value cannot be None.
+    message_fmt : str
+        The error message to return if the input value is not less than the given value.
 
-    return inner
+    Returns
+    -------
+    function
+        A function that takes an input value and returns the error message if the input value is not less than the given value.
     """
-
-    def lt(
-        rhs: float,
-        allow_none: bool = False,
-        message_fmt="Must be less than {rhs}.",
-    ):
-        def inner(value):
-            compare(
-                rhs=rhs,
-                message_fmt=message_fmt,
-                allow_none=allow_none,
-                operator=lambda value, rhs: value < rhs,
-            )
-
-        return inner
+    return compare_spec(
+        "lt", rhs, message_fmt, allow_none, lambda value, rhs: value < rhs
+    )
 
 
 def lte(
@@ -577,16 +790,9 @@ def lte(
     message_fmt : str
         The error message format.
     """
-
-    def inner(value):
-        compare(
-            rhs=rhs,
-            message_fmt=message_fmt,
-            allow_none=allow_none,
-            operator=lambda value, rhs: value <= rhs,
-        )
-
-    return inner
+    return compare_spec(
+        "lte", rhs, message_fmt, allow_none, lambda value, rhs: value <= rhs
+    )
 
 
 def equal(rhs: float, allow_none: bool = False, message_fmt="Must be equal to {rhs}."):
@@ -602,16 +808,9 @@ def equal(rhs: float, allow_none: bool = False, message_fmt="Must be equal to {r
     message_fmt : str
         The error message format.
     """
-
-    def inner(value):
-        compare(
-            rhs=rhs,
-            message_fmt=message_fmt,
-            allow_none=allow_none,
-            operator=lambda value, rhs: value == rhs,
-        )
-
-    return inner
+    return compare_spec(
+        "equal", rhs, message_fmt, allow_none, lambda value, rhs: value == rhs
+    )
 
 
 def not_equal(
@@ -629,13 +828,21 @@ def not_equal(
     message_fmt : str
         The error message format.
     """
+    return compare_spec(
+        "not_equal", rhs, message_fmt, allow_none, lambda value, rhs: value != rhs
+    )
 
-    def inner(value):
-        compare(
-            rhs=rhs,
-            message_fmt=message_fmt,
-            allow_none=allow_none,
-            operator=lambda value, rhs: value != rhs,
-        )
 
-    return inner
+def compare_spec(
+    name: str, rhs: float, message_fmt: str, allow_none: bool, operator: Callable
+):
+    inner = compare(
+        rhs=rhs, message_fmt=message_fmt, operator=operator, allow_none=allow_none
+    )
+    return with_spec(
+        inner,
+        name,
+        rhs=rhs,
+        allow_none=allow_none,
+        message=message_fmt.format(rhs=rhs),
+    )
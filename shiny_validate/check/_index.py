@@ -0,0 +1,177 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# File layout, all integers little-endian uint64:
+#   magic (8 bytes) | count | offsets[count + 1] | UTF-8 values, sorted by bytes
+# Sorting the UTF-8 bytes sorts the strings by code point, so lookups are a binary
+# search over the offsets without decoding anything.
+magic = b"SVIDX\x00\x01\x00"
+header = struct.Struct("<8sQ")
+
+# Indexes opened from files, shared by every session in the process
+registry: Dict[str, "ValueIndex"] = {}
+registry_lock = threading.Lock()
+
+
+class ValueIndex:
+    """
+    An immutable, sorted set of strings for membership, prefix and range queries.
+
+    Indexes built with `ValueIndex.build()` are stored in a compact binary file that
+    `ValueIndex.open()` memory-maps: opening is instant, the values stay out of the
+    Python heap, and the operating system shares the pages between processes.
+    `open()` also returns the same instance for the same file, so every session in
+    a process shares one index.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], path: Optional[str] = None):
+        found, count = header.unpack_from(buffer, 0)
+        if found != magic:
+            raise ValueError("Not a value index file")
+        self.path: Optional[str] = path
+        self.__buffer = buffer
+        self.__count: int = count
+        self.__offsets = memoryview(buffer)[
+            header.size : header.size + 8 * (count + 1)
+        ].cast("Q")
+        self.__data_start: int = header.size + 8 * (count + 1)
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "ValueIndex":
+        """
+        Build an in-memory index, for example for tests or small sets.
+        """
+        return cls(encode(values))
+
+    @classmethod
+    def build(
+        cls, values: Iterable[str], path: Union[str, os.PathLike]
+    ) -> "ValueIndex":
+        """
+        Write an index of `values` to `path` and open it. Duplicate values are
+        dropped. An index that is already open for `path` is replaced.
+        """
+        path = os.path.abspath(path)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(encode(values))
+        os.replace(tmp, path)
+        with registry_lock:
+            registry.pop(path, None)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike]) -> "ValueIndex":
+        """
+        Memory-map an index file written by `build()`. Every call with the same
+        file returns the same instance.
+        """
+        path = os.path.abspath(path)
+        with registry_lock:
+            index = registry.get(path)
+            if index is None:
+                with open(path, "rb") as f:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                index = registry[path] = cls(buffer, path)
+        return index
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self.__count
+        if not 0 <= i < self.__count:
+            raise IndexError("index out of range")
+        return self.__bytes(i).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return self.__values(0, self.__count)
+
+    def __contains__(self, value) -> bool:
+        if not isinstance(value, str):
+            return False
+        key = value.encode("utf-8")
+        i = self.__bisect(key)
+        return i < self.__count and self.__bytes(i) == key
+
+    def contains(self, value) -> bool:
+        return value in self
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        The values that start with `prefix`, in sorted order.
+        """
+        key = prefix.encode("utf-8")
+        start = self.__bisect(key)
+        end = start
+        while end < self.__count and self.__bytes(end).startswith(key):
+            end += 1
+            if limit is not None and end - start >= limit:
+                break
+        return self.__values(start, end)
+
+    def range(
+        self,
+        low: Optional[str] = None,
+        high: Optional[str] = None,
+        inclusive: Tuple[bool, bool] = (True, False),
+    ) -> Iterator[str]:
+        """
+        The values between `low` and `high`, in sorted order. A bound of None is
+        unbounded; `inclusive` tells whether each bound is included.
+        """
+        start = 0
+        if low is not None:
+            start = self.__bisect(low.encode("utf-8"), right=not inclusive[0])
+        end = self.__count
+        if high is not None:
+            end = self.__bisect(high.encode("utf-8"), right=inclusive[1])
+        return self.__values(start, max(start, end))
+
+    def close(self):
+        if self.path is not None:
+            with registry_lock:
+                if registry.get(self.path) is self:
+                    del registry[self.path]
+        self.__offsets.release()
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    def __bytes(self, i: int) -> bytes:
+        start = self.__data_start + self.__offsets[i]
+        end = self.__data_start + self.__offsets[i + 1]
+        return self.__buffer[start:end]
+
+    def __values(self, start: int, end: int) -> Iterator[str]:
+        for i in range(start, end):
+            yield self.__bytes(i).decode("utf-8")
+
+    def __bisect(self, key: bytes, right: bool = False) -> int:
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self.__bytes(mid)
+            if value < key or (right and value == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def encode(values: Iterable[str]) -> bytes:
+    encoded = sorted({value.encode("utf-8") for value in values})
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return b"".join(
+        [
+            header.pack(magic, len(encoded)),
+            struct.pack(f"<{len(offsets)}Q", *offsets),
+            *encoded,
+        ]
+    )
+
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import queue
+import re
+import sqlite3
+import threading
+from typing import Dict, Optional, Union
+
+from shiny import reactive
+
+from ..executor import RuleExecutor, default_executor
+from ._check import err_msg_allow_none, with_spec
+
+identifier_pattern = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# SQLite limits the number of parameters of a statement (999 before 3.32)
+max_batch_size = 900
+
+pool_size = 4
+
+# The longest a lookup started during a reactive flush waits for the flush to end
+# before its batch is sent anyway, in seconds
+max_batch_wait = 0.5
+
+# Shared by every session in the process
+pools: Dict[str, "ConnectionPool"] = {}
+loaders: Dict[tuple, "LookupLoader"] = {}
+registry_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    A fixed number of SQLite connections to one database, shared between threads.
+    """
+
+    def __init__(self, database: str, size: int = pool_size):
+        self.database: str = database
+        self.__size: int = size
+        self.__created: int = 0
+        self.__idle: queue.LifoQueue = queue.LifoQueue()
+        self.__lock = threading.Lock()
+
+    def execute(self, sql: str, params: list) -> list:
+        connection = self.__acquire()
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            self.__idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self.__idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __acquire(self) -> sqlite3.Connection:
+        try:
+            return self.__idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.__lock:
+            create = self.__created < self.__size
+            if create:
+                self.__created += 1
+        if create:
+            return sqlite3.connect(self.database, check_same_thread=False)
+        return self.__idle.get()
+
+
+class LookupLoader:
+    """
+    Collects the values looked up in one column during one reactive flush (or one
+    event loop iteration outside of a flush) and answers them all with a single
+    query.
+    """
+
+    def __init__(
+        self, pool: ConnectionPool, table: str, column: str, executor: RuleExecutor
+    ):
+        self.__pool: ConnectionPool = pool
+        self.__sql: str = (
+            f'SELECT DISTINCT "{column}" FROM "{table}" WHERE "{column}" IN '
+        )
+        self.__executor: RuleExecutor = executor
+        self.__pending: dict = {}
+        self.queries: int = 0
+
+    async def exists(self, value) -> bool:
+        pending = self.__pending.get(value)
+        if pending is None:
+            if not self.__pending:
+                self.__schedule()
+            loop = asyncio.get_running_loop()
+            pending = self.__pending[value] = loop.create_future()
+        # A cancelled caller must not cancel the answer for the others
+        return await asyncio.shield(pending)
+
+    def __schedule(self):
+        loop = asyncio.get_running_loop()
+        # Shiny yields to the event loop after every effect, so rules keep starting
+        # until the flush ends; the batch waits for it, but no longer than
+        # `max_batch_wait`. Whichever comes first sends the batch.
+        if reactive.lock().locked():
+            reactive.on_flushed(self.__flushed, once=True)
+            loop.call_later(max_batch_wait, self.__dispatch)
+        else:
+            loop.call_soon(self.__dispatch)
+
+    async def __flushed(self):
+        self.__dispatch()
+
+    def __dispatch(self):
+        if not self.__pending:
+            return
+        batch, self.__pending = self.__pending, {}
+        asyncio.ensure_future(self.__load(batch))
+
+    async def __load(self, batch: dict):
+        values = list(batch)
+        try:
+            found = set()
+            for i in range(0, len(values), max_batch_size):
+                found.update(
+                    await self.__executor.run(
+                        self.__query, values[i : i + max_batch_size]
+                    )
+                )
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Callers that were cancelled never retrieve it
+                    future.exception()
+            return
+        for value, future in batch.items():
+            if not future.done():
+                future.set_result(value in found)
+
+    def __query(self, values: list) -> set:
+        self.queries += 1
+        placeholders = ", ".join("?" * len(values))
+        rows = self.__pool.execute(f"{self.__sql}({placeholders})", values)
+        return {row[0] for row in rows}
+
+
+def get_loader(
+    database: str, table: str, column: str, executor: RuleExecutor
+) -> LookupLoader:
+    if database != ":memory:":
+        database = os.path.abspath(database)
+    with registry_lock:
+        pool = pools.get(database)
+        if pool is None:
+            pool = pools[database] = ConnectionPool(database)
+        key = (database, table, column, executor)
+        loader = loaders.get(key)
+        if loader is None:
+            loader = loaders[key] = LookupLoader(pool, table, column, executor)
+    return loader
+
+
+def lookup(
+    database: Union[str, os.PathLike],
+    table: str,
+    column: str,
+    message: Optional[str] = None,
+    exists: bool = True,
+    allow_none: bool = False,
+    executor: Optional[RuleExecutor] = None,
+):
+    """
+    Generate an async validation function that checks the input value against a
+    column of an SQLite table.
+
+    Lookups from every field and session that start during the same reactive flush
+    are combined into a single `SELECT ... WHERE column IN (...)` query, run on a
+    shared pool of connections off the event loop. The number of queries grows with
+    the number of validation passes, not with the number of sessions and fields.
+
+    Parameters
+    ----------
+    database : str
+        The path of the SQLite database.
+    table : str
+        The table to look the value up in.
+    column : str
+        The column to look the value up in.
+    message : str, optional
+        The error message to return if the check fails. Defaults to "Not found." if
+        `exists` is True and "Already exists." otherwise.
+    exists : bool, optional
+        If True, the value must be in the column; if False, it must not be (for
+        example for a username that must be unique). Default is True.
+    allow_none : bool, optional
+        If True, None values are allowed. Default is False.
+    executor : RuleExecutor, optional
+        The pool that runs the queries. Defaults to the pool used by
+        `InputValidator.add_rule(offload=True)`.
+
+    Returns
+    -------
+    function
+        A coroutine function that takes an input value and returns the error message if the check fails.
+    """
+    for name, identifier in (("table", table), ("column", column)):
+        if not identifier_pattern.match(identifier):
+            raise ValueError(f"`{name}` must be a plain SQL identifier")
+    if message is None:
+        message = "Not found." if exists else "Already exists."
+    database = os.fspath(database)
+    loader = get_loader(database, table, column, executor or default_executor)
+
+    async def inner(value):
+        if value is None:
+            if not allow_none:
+                return err_msg_allow_none
+            return
+        if await loader.exists(value) != exists:
+            return message
+
+    return with_spec(
+        inner,
+        "lookup",
+        database=database,
+        table=table,
+        column=column,
+        exists=exists,
+        allow_none=allow_none,
+        message=message,
+    )
@@ -1,5 +1,9 @@
+import weakref
 from htmltools import HTMLDependency
 from pathlib import PurePath
+from typing import Optional
+from shiny import ui, Session
+from shiny.session import require_active_session
 
 html_deps = HTMLDependency(
     "shiny_validate",
@@ -10,3 +14,32 @@ html_deps = HTMLDependency(
     },
     script={"src": "index.js", "type": "module"},
 )
+
+# Root sessions that already have the dependency, either inserted by a validator or
+# included in the page's UI
+sessions_with_deps: "weakref.WeakSet[Session]" = weakref.WeakSet()
+
+
+def include_html_deps(session: Optional[Session] = None):
+    """
+    Declare that the page already includes `html_deps` statically (for example
+    `ui.page_fluid(html_deps, ...)`), so validators don't insert it again.
+
+    Parameters
+    ----------
+    session
+        The session to mark. Defaults to the current session.
+    """
+    session = require_active_session(session)
+    sessions_with_deps.add(session.root_scope())
+
+
+def insert_html_deps(session: Session):
+    """
+    Insert `html_deps` into the page of `session`, at most once per session.
+    """
+    root = session.root_scope()
+    if root in sessions_with_deps:
+        return
+    ui.insert_ui(html_deps, "body", "beforeEnd", immediate=True, session=root)
+    sessions_with_deps.add(root)
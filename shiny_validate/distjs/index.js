@@ -3091,32 +3091,55 @@
       }
     };
     strategies.push(bindingStrategy);
+    var bs3 = null;
+    var bsElements = /* @__PURE__ */ new WeakMap();
     var bsStrategy = {
       isBS3: function isBS3() {
-        if (!$.fn.tab) {
-          return false;
+        if (bs3 === null) {
+          bs3 = Boolean($.fn.tab && $.fn.tab.Constructor.VERSION.match(/^3\./));
         }
-        return $.fn.tab.Constructor.VERSION.match(/^3\./);
+        return bs3;
       },
       findInputContainer: function findInputContainer(el) {
         el = $(el);
         var inputContainer = el.is(".form-group") ? el : el.parents(".form-group");
         return inputContainer.length === 0 ? null : inputContainer;
       },
+      resolve: function resolve(el) {
+        if (!bsElements.has(el)) {
+          var container = this.findInputContainer(el);
+          var resolved = null;
+          if (container) {
+            var control = container.find(".form-control");
+            resolved = {
+              container,
+              control: control.length ? control : null
+            };
+          }
+          bsElements.set(el, resolved);
+        }
+        return bsElements.get(el) || null;
+      },
       setInvalid: function setInvalid3(el, binding, id, data) {
-        if (data.type !== "error") {
+        if (data.type !== "error" && data.type !== "pending") {
           return false;
         }
-        var inputContainer = this.findInputContainer(el);
-        if (!inputContainer) {
+        var resolved = this.resolve(el);
+        if (!resolved) {
           return false;
         }
+        var inputContainer = resolved.container;
+        if (data.type === "pending") {
+          this.clearInvalid(el, binding, id, null);
+          inputContainer.addClass("shiny-validation-pending");
+          return true;
+        }
+        inputContainer.removeClass("shiny-validation-pending");
         if (this.isBS3()) {
           inputContainer.addClass("has-error");
         } else {
-          var control = inputContainer.find(".form-control");
-          if (control.length) {
-            control.addClass("is-invalid");
+          if (resolved.control) {
+            resolved.control.addClass("is-invalid");
           } else {
             inputContainer.addClass("is-invalid");
           }
@@ -3134,73 +3157,390 @@
         return true;
       },
       clearInvalid: function clearInvalid3(el, binding, id) {
-        var inputContainer = this.findInputContainer(el);
-        if (!inputContainer) {
+        var resolved = this.resolve(el);
+        if (!resolved) {
           return false;
         }
+        var inputContainer = resolved.container;
+        inputContainer.removeClass("shiny-validation-pending");
         if (this.isBS3()) {
           inputContainer.removeClass("has-error");
+        } else if (resolved.control) {
+          resolved.control.removeClass("is-invalid");
         } else {
-          var control = inputContainer.find(".form-control");
-          if (control.length) {
-            control.removeClass("is-invalid");
-          } else {
-            inputContainer.removeClass("is-invalid");
-          }
+          inputContainer.removeClass("is-invalid");
         }
         inputContainer.children(".shiny-validation-message").remove();
         return true;
       }
     };
     strategies.push(bsStrategy);
-    function setInvalid4(el, binding, id) {
-      var data = arguments.length > 3 && arguments[3] !== void 0 ? arguments[3] : null;
+    var strategyCache = /* @__PURE__ */ new Map();
+    function runStrategies(kind, el, binding, id, data) {
+      var key = kind + ":" + id;
+      var cached = strategyCache.get(key);
+      if (cached && cached[kind](el, binding, id, data)) {
+        return true;
+      }
       for (var i = 0; i < strategies.length; i++) {
-        if (strategies[i].setInvalid(el, binding, id, data)) {
-          return;
+        if (strategies[i] !== cached && strategies[i][kind](el, binding, id, data)) {
+          strategyCache.set(key, strategies[i]);
+          return true;
         }
       }
+      return false;
+    }
+    function forgetInput(el, id) {
+      strategyCache["delete"]("setInvalid:" + id);
+      strategyCache["delete"]("clearInvalid:" + id);
+      bsElements["delete"](el);
+    }
+    function setInvalid4(el, binding, id) {
+      var data = arguments.length > 3 && arguments[3] !== void 0 ? arguments[3] : null;
+      if (runStrategies("setInvalid", el, binding, id, data)) {
+        return;
+      }
       console.warn("Don't know how to display input validation feedback for input '" + id + "'. The message was:\n" + JSON.stringify(data));
     }
     function clearInvalid4(el, binding, id) {
-      for (var i = 0; i < strategies.length; i++) {
-        if (strategies[i].clearInvalid(el, binding, id)) {
+      if (runStrategies("clearInvalid", el, binding, id, null)) {
+        return;
+      }
+      console.warn("Don't know how to clear input validation feedback for input '" + id + "'");
+    }
+    var clientChecks = {
+      required: function required(rule, value) {
+        return value === null || value === void 0 || value === "" ? rule.message : null;
+      },
+      integer: function integer(rule, value) {
+        if (value === null || value === void 0) {
+          return rule.allow_none ? null : rule.none_message;
+        }
+        if ((typeof value === "string" || Array.isArray(value)) && value.length === 0) {
+          return rule.zero_length_message;
+        }
+        return typeof value === "boolean" || Number.isInteger(value) ? null : rule.message;
+      },
+      between: function between(rule, value) {
+        if (!isNumeric(value)) {
+          return void 0;
+        }
+        var x = +value;
+        var below = rule.inclusive[0] ? x < rule.left : x <= rule.left;
+        var above = rule.inclusive[1] ? x > rule.right : x >= rule.right;
+        return below || above ? rule.message : null;
+      },
+      in_set: function in_set(rule, value) {
+        if (value !== null && typeof value === "object") {
+          return void 0;
+        }
+        if (typeof value === "boolean" && typeof rule.values[0] === "number") {
+          value = +value;
+        }
+        return rule.values.indexOf(value) < 0 ? rule.message : null;
+      },
+      pattern: function pattern(rule, value) {
+        if (rule.allow_none && value === null) {
+          return null;
+        }
+        var re = compilePattern(rule.pattern, rule.ignore_case);
+        if (typeof value !== "string" || !re) {
+          return void 0;
+        }
+        var parts = rule.allow_multiple ? value.split(",").map(function(x) {
+          return x.trim();
+        }) : [value];
+        return parts.every(function(x) {
+          return re.test(x);
+        }) ? null : rule.message;
+      },
+      gt: comparison(function(x, rhs) {
+        return x > rhs;
+      }),
+      gte: comparison(function(x, rhs) {
+        return x >= rhs;
+      }),
+      lt: comparison(function(x, rhs) {
+        return x < rhs;
+      }),
+      lte: comparison(function(x, rhs) {
+        return x <= rhs;
+      }),
+      equal: comparison(function(x, rhs) {
+        return x === rhs;
+      }, false),
+      not_equal: comparison(function(x, rhs) {
+        return x !== rhs;
+      }, true)
+    };
+    function isNumeric(value) {
+      return typeof value === "number" || typeof value === "boolean";
+    }
+    function comparison(test, otherTypes) {
+      return function(rule, value) {
+        if (value === null || value === void 0) {
+          return rule.allow_none ? null : rule.none_message;
+        }
+        var passes = otherTypes;
+        if (isNumeric(value)) {
+          passes = test(+value, rule.rhs);
+        }
+        if (passes === void 0) {
+          return void 0;
+        }
+        return passes ? null : rule.message;
+      };
+    }
+    var patternCache = /* @__PURE__ */ new Map();
+    function compilePattern(pattern, ignoreCase) {
+      var flags = ignoreCase ? "i" : "";
+      var key = flags + "/" + pattern;
+      if (!patternCache.has(key)) {
+        var re = null;
+        try {
+          re = new RegExp(pattern, flags);
+        } catch (_unused) {
+        }
+        patternCache.set(key, re);
+      }
+      return patternCache.get(key) || null;
+    }
+    function evaluateRules(rules, value) {
+      for (var i = 0; i < rules.length; i++) {
+        var rule = rules[i];
+        var check = rule && clientChecks[rule.name];
+        if (!rule || !check) {
+          return void 0;
+        }
+        var message = check(rule, value);
+        if (message === void 0) {
+          return void 0;
+        }
+        if (message !== null) {
+          return {
+            type: "error",
+            message,
+            is_html: true
+          };
+        }
+      }
+      return null;
+    }
+    var clientRules = /* @__PURE__ */ new Map();
+    var serverResults = /* @__PURE__ */ new Map();
+    var clientDeclared = false;
+    function showResult(el, binding, id, result) {
+      if (result === null) {
+        clearInvalid4(el, binding, id);
+      } else {
+        setInvalid4(el, binding, id, result);
+      }
+    }
+    function onInputChanged(evt) {
+      var rules = clientRules.get(evt.name);
+      if (!rules || !evt.el || !evt.binding) {
+        return;
+      }
+      var result = evaluateRules(rules, evt.value);
+      if (result === void 0) {
+        if (!serverResults.has(evt.name)) {
           return;
         }
+        result = serverResults.get(evt.name);
       }
-      console.warn("Don't know how to clear input validation feedback for input '" + id + "'");
+      queueResult(evt.name, result);
     }
+    var boundInputs = null;
     function getBoundInputsMap() {
-      var results = /* @__PURE__ */ new Map();
-      $(".shiny-bound-input").each(function(index, el) {
-        var binding = $(el).data("shiny-input-binding");
-        if (binding) {
-          var id = binding.getId(el);
-          results.set(id, {
-            id,
-            el,
-            binding
-          });
+      if (boundInputs === null) {
+        boundInputs = /* @__PURE__ */ new Map();
+        $(".shiny-bound-input").each(function(_i, el) {
+          var binding = $(el).data("shiny-input-binding");
+          if (binding) {
+            var id = binding.getId(el);
+            boundInputs.set(id, {
+              id,
+              el,
+              binding
+            });
+          }
+        });
+      }
+      return boundInputs;
+    }
+    function onBound(evt) {
+      if (evt.bindingType !== "input") {
+        return;
+      }
+      var id = evt.binding.getId(evt.target);
+      forgetInput(evt.target, id);
+      if (boundInputs !== null) {
+        boundInputs.set(id, {
+          id,
+          el: evt.target,
+          binding: evt.binding
+        });
+      }
+      if (serverResults.has(id)) {
+        queueResult(id, serverResults.get(id));
+      }
+      queueVisibilityCheck();
+    }
+    function onUnbound(evt) {
+      if (evt.bindingType !== "input") {
+        return;
+      }
+      var id = evt.binding.getId(evt.target);
+      forgetInput(evt.target, id);
+      var input = boundInputs && boundInputs.get(id);
+      if (input && input.el === evt.target) {
+        boundInputs["delete"](id);
+      }
+      queueVisibilityCheck();
+    }
+    var pendingResults = /* @__PURE__ */ new Map();
+    var frameRequested = false;
+    function queueResult(id, result) {
+      pendingResults.set(id, result);
+      if (!frameRequested) {
+        frameRequested = true;
+        window.requestAnimationFrame(flushResults);
+      }
+    }
+    function flushResults() {
+      frameRequested = false;
+      var inputs = getBoundInputsMap();
+      pendingResults.forEach(function(result, id) {
+        var input = inputs.get(id);
+        if (!input) {
+          console.warn("Couldn't perform validation update on input with id '" + id + "': input not found");
+          return;
         }
+        showResult(input.el, input.binding, input.id, result);
+      });
+      pendingResults.clear();
+    }
+    var compactStreams = /* @__PURE__ */ new Map();
+    function decodeCompact(message) {
+      var stream = compactStreams.get(message.s);
+      if (message.r || !stream) {
+        stream = {
+          prefixes: [],
+          fields: [],
+          messages: []
+        };
+        compactStreams.set(message.s, stream);
+      }
+      (message.p || []).forEach(function(prefix) {
+        stream.prefixes.push(prefix);
+      });
+      var fields = message.f || [];
+      for (var i = 0; i < fields.length; i += 2) {
+        stream.fields.push(stream.prefixes[fields[i]] + fields[i + 1]);
+      }
+      (message.m || []).forEach(function(entry) {
+        stream.messages.push({
+          type: entry[0],
+          message: entry[1],
+          is_html: entry[2]
+        });
       });
+      var results = /* @__PURE__ */ new Map();
+      var errors = message.e || [];
+      for (var _i = 0; _i < errors.length; _i += 2) {
+        results.set(stream.fields[errors[_i]], stream.messages[errors[_i + 1]]);
+      }
+      if (message.c) {
+        var bytes = atob(message.c);
+        for (var _i2 = 0; _i2 < bytes.length; _i2++) {
+          var _byte = bytes.charCodeAt(_i2);
+          for (var bit = 0; bit < 8; bit++) {
+            if (_byte & 1 << bit) {
+              results.set(stream.fields[_i2 * 8 + bit], null);
+            }
+          }
+        }
+      }
       return results;
     }
+    function declareClient() {
+      if (!clientDeclared) {
+        clientDeclared = true;
+        Shiny.setInputValue("shinyvalidate_client", 2);
+      }
+    }
+    function receiveResult(id, result) {
+      serverResults.set(id, result);
+      queueResult(id, result);
+    }
+    var visibilityTracked = false;
+    var visibilityRequested = false;
+    var lastHidden = null;
+    function isHidden(el) {
+      var container = $(el).closest(".shiny-input-container")[0] || el;
+      return container.getClientRects().length === 0;
+    }
+    function trackVisibility() {
+      if (!visibilityTracked) {
+        visibilityTracked = true;
+        queueVisibilityCheck();
+      }
+    }
+    function queueVisibilityCheck() {
+      if (!visibilityTracked || visibilityRequested) {
+        return;
+      }
+      visibilityRequested = true;
+      window.requestAnimationFrame(reportVisibility);
+    }
+    function reportVisibility() {
+      visibilityRequested = false;
+      var hidden = [];
+      getBoundInputsMap().forEach(function(input, id) {
+        if (isHidden(input.el)) {
+          hidden.push(id);
+        }
+      });
+      hidden.sort();
+      var key = JSON.stringify(hidden);
+      if (key !== lastHidden) {
+        lastHidden = key;
+        Shiny.setInputValue("shinyvalidate_hidden", hidden);
+      }
+    }
     if (window.Shiny) {
+      $(document).on("shiny:inputchanged", onInputChanged);
+      $(document).on("shiny:bound", onBound);
+      $(document).on("shiny:unbound", onUnbound);
+      $(document).on("shown hidden", queueVisibilityCheck);
+      ["shown.bs.tab", "hidden.bs.tab", "shown.bs.collapse", "hidden.bs.collapse"].forEach(function(type) {
+        document.addEventListener(type, queueVisibilityCheck);
+      });
+      Shiny.addCustomMessageHandler("validation-rules-jcheng5", function(message) {
+        var keys = Object.keys(message);
+        for (var _i = 0; _i < keys.length; _i++) {
+          var rules = message[keys[_i]];
+          if (rules === null) {
+            clientRules["delete"](keys[_i]);
+          } else {
+            clientRules.set(keys[_i], rules);
+          }
+        }
+        declareClient();
+      });
       Shiny.addCustomMessageHandler("validation-jcheng5", function(message) {
-        var boundInputsMap = getBoundInputsMap();
         for (var _i = 0, _Object$entries = Object.entries(message); _i < _Object$entries.length; _i++) {
           var _Object$entries$_i = _slicedToArray(_Object$entries[_i], 2), key = _Object$entries$_i[0], value = _Object$entries$_i[1];
-          var input = boundInputsMap.get(key);
-          if (!input) {
-            console.warn("Couldn't perform validation update on input with id '" + key + "': input not found");
-            continue;
-          }
-          if (value === null) {
-            clearInvalid4(input.el, input.binding, input.id);
-          } else {
-            setInvalid4(input.el, input.binding, input.id, value);
-          }
+          receiveResult(key, value);
         }
+        declareClient();
+        trackVisibility();
+      });
+      Shiny.addCustomMessageHandler("validation-compact-jcheng5", function(message) {
+        decodeCompact(message).forEach(function(value, key) {
+          receiveResult(key, value);
+        });
+        trackVisibility();
       });
     }
   })();
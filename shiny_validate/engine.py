@@ -0,0 +1,158 @@
+import inspect
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .validator import rule_result
+
+err_msg_unexpected = "An unexpected error occurred during input validation: "
+
+
+class ValidationEngine:
+    """
+    Validate plain dicts with the same rules as an `InputValidator`, without a Shiny
+    session or any reactive machinery.
+
+    Rules and child validators are added just like on an `InputValidator`, or an
+    existing validator's structure can be copied with `InputValidator.to_engine()`.
+    Results have the same shape as `InputValidator.validate()`.
+    """
+
+    def __init__(self):
+        self.__rules: Dict[str, List[Callable]] = {}
+        self.__children: Dict[str, ValidationEngine] = {}
+        self.__condition: Optional[Callable] = None
+        self.__plan: Optional[Tuple[list, List[ValidationEngine]]] = None
+        self.__parents: List[ValidationEngine] = []
+
+    def condition(self, cond: Optional[Callable] = None):
+        """
+        Only validate when `cond(data)` is truthy; otherwise every field is valid.
+        """
+        if cond is not None and not callable(cond):
+            raise ValueError("`cond` argument must be a function or None")
+        self.__condition = cond
+        self.__invalidate()
+
+    def add_validator(self, validator: "ValidationEngine", label: Optional[str] = None):
+        if not isinstance(validator, ValidationEngine):
+            raise ValueError(
+                "`validator` argument must be an instance of ValidationEngine"
+            )
+        label = label or str(validator)
+        self.__children[label] = validator
+        validator.__parents.append(self)
+        self.__invalidate()
+
+    def add_rule(self, inputId: str, rule: Callable):
+        if not callable(rule):
+            raise ValueError("`rule` argument must be a function")
+        self.__rules.setdefault(inputId, []).append(rule)
+        self.__invalidate()
+
+    def fields(self) -> List[str]:
+        return list(self.__rules.keys())
+
+    def validate(self, data: Mapping) -> dict:
+        """
+        Validate one record. Coroutine rules need `validate_async()`.
+        """
+        plan, conditional = self.__compiled()
+        if not self.__active(data):
+            return {name: None for name in self.__all_fields()}
+        results = {}
+        for child in conditional:
+            results.update(child.validate(data))
+        for name, rules in plan:
+            results[name] = self.__validate_field(name, rules, data.get(name))
+        return results
+
+    async def validate_async(self, data: Mapping) -> dict:
+        """
+        Validate one record, awaiting coroutine rules.
+        """
+        plan, conditional = self.__compiled()
+        if not self.__active(data):
+            return {name: None for name in self.__all_fields()}
+        results = {}
+        for child in conditional:
+            results.update(await child.validate_async(data))
+        for name, rules in plan:
+            value = data.get(name)
+            results[name] = None
+            for rule in rules:
+                try:
+                    result = rule(value)
+                    if inspect.isawaitable(result):
+                        result = await result
+                except Exception as e:
+                    result = err_msg_unexpected + str(e)
+                stop, outcome = rule_result(name, result)
+                if stop:
+                    results[name] = outcome
+                    break
+        return results
+
+    def validate_many(self, records: Iterable[Mapping]) -> Iterator[dict]:
+        for data in records:
+            yield self.validate(data)
+
+    def errors(self, data: Mapping) -> Dict[str, str]:
+        """
+        The error message of every failing field of one record.
+        """
+        return {
+            name: result["message"]
+            for name, result in self.validate(data).items()
+            if result is not None
+        }
+
+    def is_valid(self, data: Mapping) -> bool:
+        return all(result is None for result in self.validate(data).values())
+
+    def __active(self, data: Mapping) -> bool:
+        return self.__condition is None or bool(self.__condition(data))
+
+    def __all_fields(self) -> List[str]:
+        plan, conditional = self.__compiled()
+        names = [name for child in conditional for name in child.__all_fields()]
+        return names + [name for name, _ in plan]
+
+    def __invalidate(self):
+        self.__plan = None
+        for parent in self.__parents:
+            parent.__invalidate()
+
+    def __compiled(self):
+        # Children without a condition are flattened once into a list of
+        # (field, rules), so that each record is a single pass over the fields.
+        # Children with a condition are validated on their own.
+        if self.__plan is None:
+            plan = {}
+            conditional = []
+            for child in self.__children.values():
+                if child.__condition is not None:
+                    conditional.append(child)
+                    continue
+                child_plan, child_conditional = child.__compiled()
+                conditional.extend(child_conditional)
+                plan.update(child_plan)
+            plan.update(self.__rules)
+            self.__plan = (list(plan.items()), conditional)
+        return self.__plan
+
+    def __validate_field(self, name: str, rules: List[Callable], value):
+        for rule in rules:
+            try:
+                result = rule(value)
+            except Exception as e:
+                result = err_msg_unexpected + str(e)
+            if result is None:
+                continue
+            if inspect.isawaitable(result):
+                result.close()
+                raise ValueError(
+                    f"The rule for '{name}' is a coroutine; use `validate_async()`"
+                )
+            stop, outcome = rule_result(name, result)
+            if stop:
+                return outcome
+        return None
@@ -21,7 +21,8 @@ app_ui = ui.page_fluid(
 
 
 def server(input: Inputs, output: Outputs, session: Session):
-    iv = InputValidator()
+    # Once enabled, only fields changed since the last submit re-run their rules
+    iv = InputValidator(track_dirty=True)
     iv.add_rule("name", check.required())
     iv.add_rule("email", check.required())
     iv.add_rule("email", check.email())
@@ -48,6 +49,7 @@ def server(input: Inputs, output: Outputs, session: Session):
             ui.modal_show(m)
         else:
             iv.enable()
+            iv.mark_clean()
             ui.notification_show(
                 "Please correct errors in the form and try again", duration=4
             )
@@ -26,7 +26,10 @@ def password_server(
     iv = InputValidator()
     if required:
         iv.add_rule("pw1", check.required())
-    iv.add_rule("pw2", lambda x: "Passwords do not match" if x != input.pw1() else None)
+    iv.add_cross_rule(
+        ["pw1", "pw2"],
+        lambda pw1, pw2: "Passwords do not match" if pw1 != pw2 else None,
+    )
 
     if password_rule is not None:
         iv.add_rule("pw1", password_rule)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class ExecutorBusy(RuntimeError):
+    """
+    Raised by `RuleExecutor.run()` when its queue is full.
+    """
+
+
+class RuleExecutor:
+    """
+    Run validation rules on a thread or process pool instead of the event loop.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor, optional
+        The pool that runs the rules. By default a `ThreadPoolExecutor` is created on
+        first use. Rules run on a `ProcessPoolExecutor` must be picklable, so they
+        should be module-level functions.
+    max_queue : int, optional
+        The maximum number of rule calls queued on or running in the pool, by
+        default 32. Further calls fail at once with `ExecutorBusy` rather than
+        piling up.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_queue: int = 32):
+        if max_queue < 1:
+            raise ValueError("`max_queue` must be at least 1")
+        self.__executor: Optional[Executor] = executor
+        self.__max_queue: int = max_queue
+        # Counted until the pool finishes the call, not until the caller gives up
+        self.__queued: int = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(thread_name_prefix="shiny_validate")
+        return self.__executor
+
+    async def run(self, fn: Callable, value):
+        """
+        Call `fn(value)` on the pool and return its result. Raises `ExecutorBusy`
+        if `max_queue` calls are already queued.
+        """
+        with self.__lock:
+            if self.__queued >= self.__max_queue:
+                raise ExecutorBusy(f"{self.__max_queue} rule calls are already queued")
+            self.__queued += 1
+        try:
+            future = self.executor.submit(fn, value)
+        except BaseException:
+            self.__release(None)
+            raise
+        future.add_done_callback(self.__release)
+        # Cancelling the caller cancels the call if the pool hasn't started it
+        return await asyncio.wrap_future(future)
+
+    @property
+    def queued(self) -> int:
+        return self.__queued
+
+    def __release(self, future: Optional[Future]):
+        with self.__lock:
+            self.__queued -= 1
+
+    def shutdown(self, wait: bool = True):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=wait)
+            self.__executor = None
+
+
+default_executor = RuleExecutor()
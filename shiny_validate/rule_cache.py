@@ -0,0 +1,208 @@
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ._cache import memo_key
+
+missing = object()
+
+
+class RuleCache:
+    """
+    A process-wide cache of rule results, shared by every session.
+
+    Decorate a rule with `RuleCache.rule()` to look its results up by value before
+    calling it, for example for rules that check uniqueness or existence against a
+    backend. Concurrent calls of an async rule for the same value share one call.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of results to keep, by default 1024. The least recently
+        used result is evicted first.
+    ttl : float, optional
+        How long a result stays valid, in seconds. By default results only leave
+        the cache when they are evicted or invalidated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("`ttl` must be positive or None")
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        # (rule key, value key) -> (expiry time, result)
+        self.__data: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__running: Dict[Hashable, asyncio.Future] = {}
+        # Bumped by invalidate(), so that calls in flight don't store stale results
+        self.__generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.expired: int = 0
+
+    def rule(self, fn: Optional[Callable] = None, *, key: Optional[Hashable] = None):
+        """
+        Decorate a rule (a function or a coroutine function of the value) so that its
+        results are cached.
+
+        Rules are identified by `key`, which defaults to the function's module and
+        qualified name, so the same function defined in every session's server
+        function shares its results. Lambdas, closures (functions that use
+        variables of an enclosing function, such as per-session state) and other
+        callables can compute different things under the same name, so they need
+        an explicit `key`.
+        """
+        if fn is None:
+            return lambda fn: self.rule(fn, key=key)
+        if not callable(fn):
+            raise ValueError("`fn` argument must be a function")
+        if key is None:
+            if (
+                not inspect.isfunction(fn)
+                or fn.__name__ == "<lambda>"
+                or fn.__closure__
+            ):
+                raise ValueError(
+                    "Lambdas, closures and callable objects need an explicit `key`"
+                )
+            key = f"{fn.__module__}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def cached(value):
+                return await self.__call_async(key, fn, value)
+
+        else:
+
+            @functools.wraps(fn)
+            def cached(value):
+                return self.__call(key, fn, value)
+
+        cached.cache_key = key
+        return cached
+
+    def invalidate(self, rule: Optional[Any] = None, value: Any = missing):
+        """
+        Drop cached results: all of them, all of `rule`'s, or `rule`'s result for
+        `value`. `rule` is a decorated rule or its key.
+        """
+        rule_key = getattr(rule, "cache_key", rule)
+        with self.__lock:
+            self.__generation += 1
+            if rule is None:
+                matches = lambda k: True  # noqa: E731
+            elif value is missing:
+                matches = lambda k: k[0] == rule_key  # noqa: E731
+            else:
+                try:
+                    entry_key = (rule_key, memo_key(value))
+                except TypeError:
+                    return
+                matches = lambda k: k == entry_key  # noqa: E731
+            for k in [k for k in self.__data if matches(k)]:
+                del self.__data[k]
+            for k in [k for k in self.__running if matches(k)]:
+                del self.__running[k]
+
+    def clear(self):
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "expired": self.expired,
+            "size": len(self.__data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+    def __call(self, key, fn: Callable, value):
+        try:
+            entry_key = (key, memo_key(value))
+        except TypeError:
+            return fn(value)
+        result = self.__get(entry_key)
+        if result is not missing:
+            return result
+        generation = self.__generation
+        result = fn(value)
+        self.__set(entry_key, result, generation)
+        return result
+
+    async def __call_async(self, key, fn: Callable, value):
+        try:
+            entry_key = (key, memo_key(value))
+        except TypeError:
+            return await fn(value)
+        result = self.__get(entry_key)
+        if result is not missing:
+            return result
+        running = self.__running.get(entry_key)
+        if running is None:
+            running = asyncio.ensure_future(self.__fill(entry_key, fn, value))
+            running.add_done_callback(consume_exception)
+            self.__running[entry_key] = running
+        else:
+            self.coalesced += 1
+        # A caller that is cancelled (e.g. because its input changed) must not
+        # cancel the call for the other callers
+        return await asyncio.shield(running)
+
+    async def __fill(self, entry_key, fn: Callable, value):
+        generation = self.__generation
+        try:
+            result = await fn(value)
+        finally:
+            if self.__running.get(entry_key) is asyncio.current_task():
+                del self.__running[entry_key]
+        self.__set(entry_key, result, generation)
+        return result
+
+    def __get(self, entry_key):
+        with self.__lock:
+            entry = self.__data.get(entry_key)
+            if entry is not None and entry[0] is not None:
+                if entry[0] <= time.monotonic():
+                    del self.__data[entry_key]
+                    self.expired += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return missing
+            self.__data.move_to_end(entry_key)
+            self.hits += 1
+            return entry[1]
+
+    def __set(self, entry_key, result, generation: int):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            self.__data[entry_key] = (expires, result)
+            self.__data.move_to_end(entry_key)
+            while len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+
+
+def consume_exception(future: asyncio.Future):
+    # The callers see the exception; this only keeps asyncio from logging it when
+    # every caller was cancelled
+    if not future.cancelled():
+        future.exception()
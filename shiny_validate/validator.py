@@ -1,9 +1,19 @@
-from shiny import reactive, ui, Session
+from shiny import reactive, Session
+from shiny.module import ResolvedId
 from shiny.session import session_context
-from .deps import html_deps
-from typing import Optional, Callable
+from .deps import insert_html_deps
+from .executor import ExecutorBusy, RuleExecutor, default_executor
+from ._ratelimit import Debounced, RateLimited, Throttled
+from ._cache import LRUCache, memo_key
+from .metrics import Stats, ValidationMetrics
+from ._wire import CompactEncoder, compact_client_version
+from .check._check import client_decides_value, client_spec, exact_client_checks
+from typing import Optional, Callable, Mapping, Sequence, Union, Dict, List, Set, Tuple
 import datetime
 import asyncio
+import inspect
+import math
+import time
 from shiny.session import get_current_session, require_active_session
 
 
@@ -13,10 +23,42 @@ class Rule:
         rule: Callable,
         label: str,
         session: Session,
+        timeout: Optional[float] = None,
+        executor: Optional[RuleExecutor] = None,
+        pure: bool = True,
+        cost: Optional[float] = None,
+        reorderable: bool = False,
     ):
         self.rule: Callable = rule
         self.label: str = label
         self.session: Session = session
+        self.timeout: Optional[float] = timeout
+        self.executor: Optional[RuleExecutor] = executor
+        self.pure: bool = pure
+        self.cost: Optional[float] = cost
+        self.reorderable: bool = reorderable
+        self.client_spec: Optional[dict] = client_spec(rule)
+        # Offloaded rules go through the same pending/cancel flow as coroutines
+        self.is_async: bool = executor is not None or inspect.iscoroutinefunction(
+            rule
+        )
+
+
+class CrossRule:
+    def __init__(
+        self,
+        rule: Callable,
+        inputs: List[str],
+        targets: List[str],
+        label: str,
+        session: Session,
+    ):
+        self.rule: Callable = rule
+        self.inputs: List[str] = inputs
+        self.targets: List[str] = targets
+        self.label: str = label
+        self.session: Session = session
+        self.calc: Optional[reactive.Calc_] = None
 
 
 class SkipValidation:
@@ -24,34 +66,106 @@ class SkipValidation:
         pass
 
 
+class PendingValidation:
+    def __init__(self):
+        pass
+
+
+pending_validation = PendingValidation()
+
+err_msg_timeout = "Validation timed out"
+err_msg_busy = "Validation queue is full"
+
+default_memo_size = 256
+
+# Calls of every rule in a group before adaptive ordering replaces the costs
+adaptive_min_calls = 20
+
+# Set by the browser once it evaluates the rules it is sent
+client_rules_input = "shinyvalidate_client"
+
+# Set by the browser to the ids of the bound inputs the user can't see
+hidden_fields_input = "shinyvalidate_hidden"
+
+
 class InputValidator:
     def __init__(
         self,
         priority=1000,
+        per_field: bool = False,
+        debounce: Optional[int] = None,
+        throttle: Optional[int] = None,
+        memoize: Union[bool, int] = False,
+        metrics: Union[ValidationMetrics, Callable[[dict], None], None] = None,
+        adaptive_order: bool = False,
+        skip_hidden: bool = False,
+        track_dirty: bool = False,
     ):
+        if debounce is not None and throttle is not None:
+            raise ValueError("Only one of `debounce` and `throttle` can be set")
         self.__session = require_active_session(get_current_session())
         self.__priority: int = priority
+        self.__per_field: bool = per_field
+        self.__default_rate_limit: Optional[Tuple[str, Optional[int]]] = None
+        if debounce is not None:
+            self.__default_rate_limit = ("debounce", debounce)
+        elif throttle is not None:
+            self.__default_rate_limit = ("throttle", throttle)
+        self.__rate_limits: Dict[str, Tuple[str, Optional[int]]] = {}
+        self.__limited_values: Dict[str, RateLimited] = {}
+        self.__memo: Optional[LRUCache] = None
+        if memoize:
+            size = default_memo_size if memoize is True else memoize
+            self.__memo = LRUCache(maxsize=size)
+        if metrics is not None and not isinstance(metrics, ValidationMetrics):
+            if not callable(metrics):
+                raise ValueError(
+                    "`metrics` argument must be a ValidationMetrics, a function or None"
+                )
+            metrics = ValidationMetrics(exporter=metrics)
+        self.__metrics: Optional[ValidationMetrics] = metrics
+        self.__adaptive_order: bool = adaptive_order
+        self.__skip_hidden: bool = skip_hidden
+        self.__track_dirty: bool = track_dirty
+        # Fields changed since enable() or mark_clean(), and the value and result
+        # each field was last validated with
+        self.__dirty: Set[str] = set()
+        self.__stored: Dict[str, Tuple[object, Optional[dict]]] = {}
+        self.__rule_stats: Dict[Tuple[str, Rule], Stats] = {}
+        # Rule calls are only timed when something uses the timings
+        self.__timed: bool = metrics is not None or adaptive_order
+        self.__field_calcs: Dict[str, reactive.Calc_] = {}
+        self.__result_calcs: Dict[bool, reactive.Calc_] = {}
+        self.__async_results: Dict[Tuple[str, Rule], reactive.Value] = {}
+        self.__async_runs: Dict[Tuple[str, Rule], Tuple[object, asyncio.Task]] = {}
         self.__condition = reactive.Value(None)
-        self.__rules: reactive.Value[dict[str, list[Rule]]] = reactive.Value({})
+        self.__rules: reactive.Value[Dict[str, List[Rule]]] = reactive.Value({})
+        self.__cross_rules: reactive.Value[List[CrossRule]] = reactive.Value([])
 
         self.__enabled: bool = False
         self.__observer_handle: Optional[reactive.Effect] = None
+        self.__last_sent: Optional[dict] = None
+        self.__last_rules: Optional[dict] = None
+        self.__last_values: dict = {}
+        self.__encoder: Optional[CompactEncoder] = None
+        self.__resync_trigger = reactive.Value(0)
         self.__is_child = False
         self.__validator_infos: reactive.Value[
-            dict[str, InputValidator]
+            Dict[str, InputValidator]
         ] = reactive.Value({})
 
-        ui.insert_ui(
-            html_deps,
-            "body",
-            "beforeEnd",
-            immediate=True,
-            session=self.__session,
-        )
-
     def parent(self, validator):
         self.disable()
         self.__is_child = True
+        if validator.__per_field:
+            self.__per_field = True
+            self.__result_calcs = {}
+        if validator.__skip_hidden:
+            self.__skip_hidden = True
+            self.__result_calcs = {}
+        if validator.__track_dirty:
+            self.__track_dirty = True
+            self.__result_calcs = {}
 
     def condition(self, cond: Optional[Callable] = None):
         if cond is None:
@@ -60,6 +174,7 @@ class InputValidator:
             if not callable(cond) and cond is not None:
                 raise ValueError("`cond` argument must be a formula or None")
             self.__condition = cond
+            self.__result_calcs = {}
 
     def add_validator(
         self,
@@ -78,36 +193,208 @@ class InputValidator:
             validators[label] = validator
             self.__validator_infos.set(validators)
 
-    def add_rule(self, inputId: str, rule: Callable):
-        label = str(rule)
+    def add_rule(
+        self,
+        inputId: str,
+        rule: Callable,
+        timeout: Optional[float] = None,
+        offload: Union[bool, RuleExecutor] = False,
+        pure: bool = True,
+        label: Optional[str] = None,
+        cost: Optional[float] = None,
+        reorderable: Optional[bool] = None,
+    ):
+        new_rule = self.__make_rule(
+            rule, timeout, offload, pure, label, cost, reorderable
+        )
+        self.__update_rules({inputId: self.__field_rules(inputId) + [new_rule]})
+
+    def add_rules(
+        self,
+        rules: Mapping[str, Union[Callable, Sequence[Callable]]],
+        timeout: Optional[float] = None,
+        offload: Union[bool, RuleExecutor] = False,
+        pure: bool = True,
+    ):
+        """
+        Add rules for many inputs at once, as a dict of input id to a rule or a list
+        of rules. The options apply to every rule. All the rules are added in a
+        single change, so the validator re-validates once.
+        """
+        changes = {}
+        for inputId, field_rules in rules.items():
+            if callable(field_rules):
+                field_rules = [field_rules]
+            changes[inputId] = self.__field_rules(inputId) + [
+                self.__make_rule(rule, timeout, offload, pure) for rule in field_rules
+            ]
+        self.__update_rules(changes)
+
+    def remove_rule(self, inputId: str, rule: Optional[Callable] = None):
+        """
+        Remove `rule` from the rules of `inputId`, or all of the input's rules if
+        `rule` is None.
+        """
+        if rule is None:
+            self.__update_rules({inputId: []})
+            return
+        field_rules = self.__field_rules(inputId)
+        remaining = [r for r in field_rules if r.rule is not rule]
+        if len(remaining) == len(field_rules):
+            raise ValueError(f"`rule` is not a rule of '{inputId}'")
+        self.__update_rules({inputId: remaining})
+
+    def replace_rules(
+        self,
+        inputId: str,
+        rules: Sequence[Callable],
+        timeout: Optional[float] = None,
+        offload: Union[bool, RuleExecutor] = False,
+        pure: bool = True,
+    ):
+        """
+        Replace all the rules of `inputId` with `rules`, in a single change.
+        """
+        new_rules = [self.__make_rule(rule, timeout, offload, pure) for rule in rules]
+        self.__update_rules({inputId: new_rules})
+
+    def add_cross_rule(
+        self,
+        inputs: Sequence[str],
+        rule: Callable,
+        targets: Union[str, Sequence[str], None] = None,
+        label: Optional[str] = None,
+    ):
+        """
+        Add a rule that checks several inputs together, such as a password and its
+        confirmation. `rule` is called with the values of `inputs`, in order, and
+        returns None, a message for every field in `targets` (by default the last
+        of `inputs`), or a dict of target to message. The rule only re-runs when
+        one of `inputs` changes, and a target only shows its message when its own
+        rules pass.
+        """
         if not callable(rule):
             raise ValueError("`rule` argument must be a function")
+        if inspect.iscoroutinefunction(rule):
+            raise ValueError("Cross-field rules can't be coroutine functions")
+        if isinstance(inputs, str) or len(inputs) == 0:
+            raise ValueError("`inputs` argument must be a non-empty list of input ids")
+        inputs = list(inputs)
+        if targets is None:
+            targets = [inputs[-1]]
+        elif isinstance(targets, str):
+            targets = [targets]
+        if label is None:
+            label = rule_label(rule)
 
-        new_rule = Rule(rule, label, session=get_current_session())
+        cross_rule = CrossRule(
+            rule, inputs, list(targets), label, session=get_current_session()
+        )
+        with reactive.isolate():
+            self.__cross_rules.set(self.__cross_rules.get() + [cross_rule])
 
+    def remove_cross_rule(self, rule: Callable):
+        """
+        Remove the cross-field rules added with `rule`.
+        """
         with reactive.isolate():
-            rules = self.__rules.get()
-            if inputId in rules.keys():
-                rules[inputId].append(new_rule)
+            cross_rules = self.__cross_rules.get()
+            remaining = [r for r in cross_rules if r.rule is not rule]
+            if len(remaining) == len(cross_rules):
+                raise ValueError("`rule` is not a cross-field rule of this validator")
+            self.__cross_rules.set(remaining)
+
+    def __make_rule(
+        self,
+        rule: Callable,
+        timeout: Optional[float],
+        offload: Union[bool, RuleExecutor],
+        pure: bool,
+        label: Optional[str] = None,
+        cost: Optional[float] = None,
+        reorderable: Optional[bool] = None,
+    ) -> Rule:
+        if not callable(rule):
+            raise ValueError("`rule` argument must be a function")
+        if offload is True:
+            offload = default_executor
+        if offload is not False and not isinstance(offload, RuleExecutor):
+            raise ValueError("`offload` argument must be a bool or a RuleExecutor")
+        if offload and inspect.iscoroutinefunction(rule):
+            raise ValueError("Coroutine rules can't be offloaded to an executor")
+        if label is None:
+            label = rule_label(rule)
+        if reorderable is None:
+            reorderable = cost is not None
+
+        return Rule(
+            rule,
+            label,
+            session=get_current_session(),
+            timeout=timeout,
+            executor=offload or None,
+            pure=pure,
+            cost=cost,
+            reorderable=reorderable,
+        )
+
+    def __field_rules(self, inputId: str) -> List[Rule]:
+        with reactive.isolate():
+            return self.__rules.get().get(inputId, [])
+
+    def __update_rules(self, changes: Dict[str, List[Rule]]):
+        # Applies new rule chains (an empty list removes the field) with a single
+        # invalidation. The dict and the changed lists are new objects, so that
+        # running chains never see a list change under them.
+        with reactive.isolate():
+            rules = dict(self.__rules.get())
+        for name, field_rules in changes.items():
+            for rule in rules.get(name, []):
+                if rule not in field_rules:
+                    self.__cancel_async((name, rule))
+                    self.__async_results.pop((name, rule), None)
+                    self.__rule_stats.pop((name, rule), None)
+            if field_rules:
+                rules[name] = list(field_rules)
             else:
-                rules[inputId] = [new_rule]
-            
-            self.__rules.unset()
+                rules.pop(name, None)
+                limited = self.__limited_values.pop(name, None)
+                if limited is not None:
+                    limited.destroy()
+            # The field's cached chain and stored result no longer match its rules
+            self.__field_calcs.pop(name, None)
+            self.__stored.pop(name, None)
+
+        with reactive.isolate():
             self.__rules.set(rules)
 
     def enable(self):
         if self.__is_child:
             return
         if not self.__enabled:
+            insert_html_deps(self.__session)
+            self.mark_clean()
             with session_context(self.__session):
 
                 @reactive.Effect(priority=self.__priority)
                 async def observer():
-                    results = self.validate()
-                    await self.__session.send_custom_message(
-                        "validation-jcheng5", results
+                    self.__resync_trigger()
+                    results = self.__validate_impl(lazy=True)
+                    rules = self.__client_rules()
+                    rule_changes = self.__changed_client_rules(rules)
+                    if rule_changes:
+                        await self.__session.send_custom_message(
+                            "validation-rules-jcheng5", rule_changes
+                        )
+                    changes = self.__changed_results(
+                        results, rules, rule_changes, self.__skipped_hidden()
                     )
+                    if changes:
+                        await self.__send_results(changes)
 
+                self.__last_sent = None
+                self.__last_rules = None
+                self.__encoder = None
                 self.__enabled = True
                 self.__observer_handle = observer
                 return observer
@@ -117,11 +404,21 @@ class InputValidator:
             self.__observer_handle.destroy()
             self.__observer_handle = None
             self.__enabled = False
+            self.__last_sent = None
+            rules = {k: None for k in self.__last_rules or {}}
+            self.__last_rules = None
+            for key in list(self.__async_runs):
+                self.__cancel_async(key)
+            self.__destroy_rate_limits()
             if not self.__is_child:
                 results = self.validate()
                 results = {k: None for k in results}
 
                 async def _disable():
+                    if rules:
+                        await self.__session.send_custom_message(
+                            "validation-rules-jcheng5", rules
+                        )
                     await self.__session.send_custom_message(
                         "validation-jcheng5", results
                     )
@@ -131,8 +428,241 @@ class InputValidator:
                 else:
                     asyncio.run(_disable())
 
+    def debounce(self, inputId: str, millis: Optional[int]):
+        """
+        Only run the rules for `inputId` once the input has been idle for `millis`
+        milliseconds. `None` turns off rate limiting for the field.
+
+        `is_valid()` and `validate()` always check the current value.
+        """
+        self.__set_rate_limit(inputId, ("debounce", millis))
+
+    def throttle(self, inputId: str, millis: Optional[int]):
+        """
+        Run the rules for `inputId` at most once every `millis` milliseconds while
+        the input keeps changing. `None` turns off rate limiting for the field.
+
+        `is_valid()` and `validate()` always check the current value.
+        """
+        self.__set_rate_limit(inputId, ("throttle", millis))
+
+    def __set_rate_limit(self, inputId: str, limit: Tuple[str, Optional[int]]):
+        self.__rate_limits[inputId] = limit
+        limited = self.__limited_values.pop(inputId, None)
+        if limited is not None:
+            limited.destroy()
+        self.__field_calcs.pop(inputId, None)
+        with reactive.isolate():
+            self.__rules.set(dict(self.__rules.get()))
+
+    def __destroy_rate_limits(self):
+        # Their observers would keep running while disabled, and the cached chains
+        # reading them would never be invalidated again
+        if self.__limited_values:
+            for name, limited in self.__limited_values.items():
+                limited.destroy()
+                self.__field_calcs.pop(name, None)
+            self.__limited_values = {}
+            with reactive.isolate():
+                self.__rules.set(dict(self.__rules.get()))
+        with reactive.isolate():
+            for validator_info in self.__validator_infos().values():
+                validator_info.__destroy_rate_limits()
+
+    def __rate_limit(self, name: str) -> Optional[Tuple[str, int]]:
+        limit = self.__rate_limits.get(name, self.__default_rate_limit)
+        if limit is None or limit[1] is None:
+            return None
+        return limit
+
+    def __field_value(self, name: str, session: Session, lazy: bool):
+        limit = self.__rate_limit(name) if lazy else None
+        if limit is None:
+            return session.input[name]()
+
+        limited = self.__limited_values.get(name)
+        if limited is None:
+            limiter = Debounced if limit[0] == "debounce" else Throttled
+            with session_context(self.__session):
+                limited = limiter(
+                    lambda: session.input[name](), limit[1], self.__priority
+                )
+            self.__limited_values[name] = limited
+        return limited()
+
+    def mark_clean(self):
+        """
+        Treat every field as unchanged from now on, for example after a submit.
+        With `track_dirty=True`, lazy passes only run the rules of fields whose
+        value changes afterwards. `enable()` also marks the validator clean.
+        """
+        self.__dirty = set()
+        with reactive.isolate():
+            for validator_info in self.__validator_infos().values():
+                validator_info.mark_clean()
+
+    def dirty_fields(self) -> List[str]:
+        """
+        The fields whose value changed since `enable()` or `mark_clean()`, when
+        the validator was created with `track_dirty=True`.
+        """
+        with reactive.isolate():
+            fields = [
+                rules[0].session.ns(name)
+                for name, rules in self.__rules().items()
+                if name in self.__dirty
+            ]
+            for validator_info in self.__validator_infos().values():
+                fields.extend(validator_info.dirty_fields())
+        return fields
+
+    def resync(self):
+        """
+        Send the full validation state to the browser on the next run, rather than
+        only the fields that changed since the last message.
+        """
+        self.__last_sent = None
+        self.__last_rules = None
+        self.__encoder = None
+        with reactive.isolate():
+            self.__resync_trigger.set(self.__resync_trigger.get() + 1)
+
+    def __changed_results(
+        self, results: dict, client_rules: dict, rule_changes: dict, hidden: frozenset
+    ) -> dict:
+        # Only fields whose state differs from what the browser last received
+        # are sent; fields that disappeared are cleared. Hidden fields weren't
+        # validated, so the browser keeps what it last received for them.
+        last = self.__last_sent
+        self.__last_sent = dict(results)
+        if last is None:
+            changes = dict(results)
+        else:
+            changes = {
+                k: v for k, v in results.items() if k not in last or last[k] != v
+            }
+            for k, v in last.items():
+                if k in results:
+                    continue
+                if k in hidden:
+                    self.__last_sent[k] = v
+                elif v is not None:
+                    changes[k] = None
+        if client_rules:
+            self.__apply_client_rules(changes, results, client_rules, rule_changes)
+        return changes
+
+    def __apply_client_rules(
+        self, changes: dict, results: dict, client_rules: dict, rule_changes: dict
+    ):
+        # The browser shows the result of the rules it mirrors as soon as an input
+        # changes. Results it computes exactly like the server aren't sent again;
+        # results of approximate (regex) mirrors are re-sent whenever the value
+        # changes, in case the browser got them wrong.
+        capable = self.__client_capable()
+        values = {}
+        for name, specs in client_rules.items():
+            if name in rule_changes or name not in results:
+                continue
+            if is_exact_mirror(specs):
+                if (
+                    capable
+                    and name in changes
+                    and client_decides(specs, results[name], self.__raw_value(name))
+                ):
+                    del changes[name]
+            else:
+                value = values[name] = self.__raw_value(name)
+                if name in self.__last_values and self.__last_values[name] != value:
+                    changes[name] = results[name]
+        self.__last_values = values
+
+    async def __send_results(self, changes: dict):
+        # Browsers that declared they decode the compact format get it; the
+        # encoder's tables live as long as the browser's copy of the results
+        if not self.__compact_capable():
+            await self.__session.send_custom_message("validation-jcheng5", changes)
+            return
+        if self.__encoder is None:
+            self.__encoder = CompactEncoder()
+        await self.__session.send_custom_message(
+            "validation-compact-jcheng5", self.__encoder.encode(changes)
+        )
+
+    def __client_capable(self) -> bool:
+        return client_rules_input in self.__session.root_scope().input
+
+    def __compact_capable(self) -> bool:
+        if not self.__client_capable():
+            return False
+        version = self.__session.root_scope().input[ResolvedId(client_rules_input)]
+        with reactive.isolate():
+            return version() >= compact_client_version
+
+    def __raw_value(self, fullname: str):
+        value = self.__session.root_scope().input[ResolvedId(fullname)]
+        with reactive.isolate():
+            return value() if value.is_set() else None
+
+    def __client_rules(self) -> dict:
+        # The mirrorable rules of every field, by namespaced id. A field gets a
+        # list with None for each rule that only the server can run.
+        if self.__skipped():
+            return {}
+        specs = {}
+        for validator_info in self.__validator_infos().values():
+            specs.update(validator_info.__client_rules())
+        # A cross-field rule is a server-only rule of each of its targets
+        cross_targets = {
+            cross_rule.session.ns(target)
+            for cross_rule in self.__cross_rules()
+            for target in cross_rule.targets
+        }
+        for name, rules in self.__rules().items():
+            fullname = rules[0].session.ns(name)
+            field_specs = [rule.client_spec for rule in rules]
+            if fullname in cross_targets:
+                field_specs.append(None)
+            if any(spec is not None for spec in field_specs):
+                specs[fullname] = field_specs
+        return specs
+
+    def __changed_client_rules(self, rules: dict) -> dict:
+        last = self.__last_rules or {}
+        self.__last_rules = rules
+        changes = {k: v for k, v in rules.items() if last.get(k) != v}
+        for k in last:
+            if k not in rules:
+                changes[k] = None
+        return changes
+
+    def to_engine(self):
+        """
+        Copy this validator's rules and child validators into a `ValidationEngine`,
+        which validates plain dicts keyed by the (namespaced) input ids without a
+        session. The validator's condition and cross-field rules are not copied.
+        """
+        from .engine import ValidationEngine
+
+        engine = ValidationEngine()
+        with reactive.isolate():
+            for label, validator in self.__validator_infos().items():
+                engine.add_validator(validator.to_engine(), label)
+            for name, rules in self.__rules().items():
+                fullname = rules[0].session.ns(name)
+                for rule in rules:
+                    engine.add_rule(fullname, rule.rule)
+        return engine
+
     def fields(self):
-        return list(self.__rules().keys())
+        fields = list(self.__rules().keys())
+        for cross_rule in self.__cross_rules():
+            fields.extend(t for t in cross_rule.targets if t not in fields)
+        return fields
+
+    @property
+    def metrics(self) -> Optional[ValidationMetrics]:
+        return self.__metrics
 
     def is_valid(self):
         results = self.validate()
@@ -142,68 +672,484 @@ class InputValidator:
         result = self.__validate_impl()
         return result
 
-    def __validate_impl(self):
+    def __skipped(self) -> bool:
         condition = self.__condition
-        skip_all = callable(condition()) and condition() is not None
+        return callable(condition()) and condition() is not None
 
-        if skip_all:
+    def __validate_impl(self, lazy: bool = False):
+        if self.__skipped():
             fields = self.fields()
             return {field: None for field in fields}
 
-        dependency_results = {}
+        # Fields the user can't see are left out of lazy passes, and validated once
+        # they are shown
+        hidden = self.__hidden_fields() if lazy else frozenset()
 
+        results = {}
         for validator_info in self.__validator_infos().values():
-            child_results = validator_info.__validate_impl()
-            dependency_results = {**dependency_results, **child_results}
+            results.update(validator_info.__result_calc(lazy)())
 
-        results = {}
         for name, rules in self.__rules().items():
             fullname = rules[0].session.ns(name)
-            results[fullname] = None
+            if fullname in hidden:
+                continue
+            if self.__track_dirty:
+                results[fullname] = self.__tracked_result(name, rules, lazy)
+            else:
+                results[fullname] = self.__field_result(name, rules, lazy)
+
+        for fullname, message in self.__cross_results(hidden).items():
+            if message is None:
+                results.setdefault(fullname, None)
+            elif results.get(fullname) is None:
+                results[fullname] = rule_result(fullname, message)[1]
+        return results
+
+    def __field_result(self, name: str, rules: List[Rule], lazy: bool):
+        if self.__per_field and (lazy or self.__rate_limit(name) is None):
+            return self.__field_calc(name)()
+        return self.__validate_field(name, rules, lazy)
+
+    def __tracked_result(self, name: str, rules: List[Rule], lazy: bool):
+        # In lazy passes, a clean field whose value is the one it was last
+        # validated with reuses that result instead of running its rules. A field
+        # whose value changes is dirty, and runs its rules on every pass until
+        # mark_clean(). Full passes always run the rules, and so do fields with an
+        # impure rule, whose result can change while the value doesn't.
+        if not all(rule.pure for rule in rules):
+            return self.__field_result(name, rules, lazy)
+        try:
+            value = rules[0].session.input[name]()
+        except Exception:
+            return self.__field_result(name, rules, lazy)
+        stored = self.__stored.get(name)
+        if stored is not None:
+            if not same_value(stored[0], value):
+                self.__dirty.add(name)
+            elif lazy and name not in self.__dirty:
+                return stored[1]
+
+        result = self.__field_result(name, rules, lazy)
+        if result is None or result["type"] != "pending":
+            self.__stored[name] = (value, result)
+        return result
+
+    def __cross_results(self, hidden: frozenset) -> Dict[str, str]:
+        # The messages of the cross-field rules by target; the first rule that
+        # fails for a target wins. Targets without a message still get a result.
+        messages = {}
+        for cross_rule in self.__cross_rules():
+            targets = {
+                target: cross_rule.session.ns(target)
+                for target in cross_rule.targets
+                if cross_rule.session.ns(target) not in hidden
+            }
+            if not targets:
+                continue
+            failed = self.__cross_calc(cross_rule)()
+            for target, fullname in targets.items():
+                if messages.get(fullname) is None:
+                    messages[fullname] = failed.get(target)
+        return messages
+
+    def __hidden_fields(self) -> frozenset:
+        if not self.__skip_hidden:
+            return frozenset()
+        hidden = self.__session.root_scope().input[ResolvedId(hidden_fields_input)]
+        return frozenset(hidden()) if hidden.is_set() else frozenset()
+
+    def __skipped_hidden(self) -> frozenset:
+        # The hidden fields that this validator or any of its children left out of
+        # lazy passes; a child can skip hidden fields when its parent doesn't
+        hidden = self.__hidden_fields()
+        for validator_info in self.__validator_infos().values():
+            hidden |= validator_info.__skipped_hidden()
+        return hidden
+
+    def __cross_calc(self, cross_rule: CrossRule) -> reactive.Calc_:
+        # Each cross-field rule is its own reactive.Calc that only reads the rule's
+        # declared inputs, so it re-runs when, and only when, one of them changes.
+        if cross_rule.calc is None:
 
-            for rule in rules:
+            def cross_result():
                 try:
-                    result = rule.rule(rule.session.input[name]())
+                    values = [cross_rule.session.input[x]() for x in cross_rule.inputs]
+                    with reactive.isolate():
+                        result = self.__call_cross_rule(cross_rule, values)
+                    return cross_messages(cross_rule, result)
                 except Exception as e:
-                    result = "An unexpected error occurred during input validation: " + str(
-                        e
+                    message = (
+                        "An unexpected error occurred during input validation: "
+                        + str(e)
                     )
+                    return {target: message for target in cross_rule.targets}
 
-                result_is_html = isinstance(result, (str, bytes))
-                if result_is_html:
-                    result = str(result)
+            with session_context(self.__session):
+                cross_rule.calc = reactive.Calc(cross_result)
+        return cross_rule.calc
 
-                is_valid_result = (
-                    result is None
-                    or (isinstance(result, str))
-                    or result == SkipValidation()
-                )
+    def __call_cross_rule(self, cross_rule: CrossRule, values: list):
+        if self.__metrics is None:
+            return cross_rule.rule(*values)
+        start = time.perf_counter()
+        field = ",".join(cross_rule.session.ns(x) for x in cross_rule.inputs)
+        try:
+            result = cross_rule.rule(*values)
+        except Exception as e:
+            self.__metrics.record_rule(
+                field, cross_rule.label, time.perf_counter() - start, True, e
+            )
+            raise
+        self.__metrics.record_rule(
+            field, cross_rule.label, time.perf_counter() - start, result is not None
+        )
+        return result
 
-                if not is_valid_result:
-                    raise ValueError(
-                        "Result of '"
-                        + name
-                        + "' validation was not a single-character vector (actual class: "
-                        + str(type(result))
-                        + ")"
-                    )
+    def __result_calc(self, lazy: bool) -> reactive.Calc_:
+        # A child validator's results are cached in a reactive.Calc, so a parent
+        # run only re-validates the children whose inputs or rules changed.
+        calc = self.__result_calcs.get(lazy)
+        if calc is None:
+            with session_context(self.__session):
+                calc = reactive.Calc(lambda: self.__validate_impl(lazy))
+            self.__result_calcs[lazy] = calc
+        return calc
 
-                if result is not None:
-                    if result == SkipValidation():
-                        results[fullname] = True
-                    else:
-                        results[fullname] = {
-                            "type": "error",
-                            "message": result,
-                            "is_html": result_is_html,
-                        }
+    def __field_calc(self, name: str) -> reactive.Calc_:
+        # In per-field mode each field's rule chain is its own reactive.Calc, so
+        # changing one input only re-runs the rules of the fields that read it.
+        calc = self.__field_calcs.get(name)
+        if calc is None:
+
+            def field_result():
+                with reactive.isolate():
+                    rules = self.__rules().get(name, [])
+                return self.__validate_field(name, rules, lazy=True)
+
+            with session_context(self.__session):
+                calc = reactive.Calc(field_result)
+            self.__field_calcs[name] = calc
+        return calc
+
+    def __validate_field(self, name: str, rules: List[Rule], lazy: bool = False):
+        if self.__metrics is None:
+            return self.__run_rules(name, rules, lazy)
+
+        start = time.perf_counter()
+        outcome = self.__run_rules(name, rules, lazy)
+        if outcome is None or outcome["type"] != "pending":
+            self.__metrics.record_field(
+                rules[0].session.ns(name),
+                time.perf_counter() - start,
+                outcome is not None,
+            )
+        return outcome
+
+    def __run_rules(self, name: str, rules: List[Rule], lazy: bool):
+        ordered = self.__ordered(name, rules)
+        for i, rule in enumerate(ordered):
+            result = self.__apply_rule(name, rule, lazy)
+            if result is pending_validation:
+                self.__cancel_remaining(name, ordered[i + 1 :])
+                return {"type": "pending", "message": None, "is_html": False}
+
+            stop, outcome = rule_result(name, result)
+            if not stop:
+                continue
+
+            # Reordering only changes how fast the result is found: the rules of
+            # the same group that were added earlier but haven't run yet may fail
+            # too, and the first failure in the order rules were added wins.
+            remaining = ordered[i + 1 :]
+            for earlier in self.__skipped_earlier(rules, rule, remaining):
+                remaining.remove(earlier)
+                result = self.__apply_rule(name, earlier, lazy)
+                if result is pending_validation:
+                    outcome = {"type": "pending", "message": None, "is_html": False}
                     break
+                stop, earlier_outcome = rule_result(name, result)
+                if stop:
+                    outcome = earlier_outcome
+                    break
+            self.__cancel_remaining(name, remaining)
+            return outcome
+
+        return None
+
+    def __apply_rule(self, name: str, rule: Rule, lazy: bool):
+        try:
+            value = self.__field_value(name, rule.session, lazy)
+            if rule.is_async:
+                return self.__async_result(name, rule, value)
+            return self.__call_rule(name, rule, value)
+        except Exception as e:
+            return "An unexpected error occurred during input validation: " + str(e)
+
+    def __async_result(self, name: str, rule: Rule, value):
+        # Coroutine rules run as tasks. The field is pending until the task for
+        # its current value finishes; a task for an outdated value is cancelled.
+        key = (name, rule)
+        state = self.__async_results.get(key)
+        if state is None:
+            state = self.__async_results[key] = reactive.Value(None)
+
+        done = state()
+        if done is not None and done[0] == value:
+            return done[1]
+
+        running = self.__async_runs.get(key)
+        if running is not None:
+            if running[0] == value:
+                return pending_validation
+            self.__cancel_async(key)
+
+        memo_hit, result = self.__memo_get(rule, value)
+        if memo_hit:
+            return result
+
+        task = asyncio.ensure_future(self.__run_async(key, rule, value, state))
+        self.__async_runs[key] = (value, task)
+        return pending_validation
+
+    async def __run_async(self, key, rule: Rule, value, state: reactive.Value):
+        start = time.perf_counter()
+        error = None
+        try:
+            if rule.executor is not None:
+                call = rule.executor.run(rule.rule, value)
+            else:
+                call = rule.rule(value)
+            result = await asyncio.wait_for(call, rule.timeout)
+        except asyncio.TimeoutError as e:
+            error = e
+            result = err_msg_timeout
+        except ExecutorBusy as e:
+            error = e
+            result = err_msg_busy
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            result = "An unexpected error occurred during input validation: " + str(e)
+
+        if self.__timed:
+            self.__record_rule(key[0], rule, time.perf_counter() - start, result, error)
+
+        async with reactive.lock():
+            # The run stays registered until its result is stored, so that a flush
+            # while it waits for the lock doesn't start the same check again
+            running = self.__async_runs.get(key)
+            if running is None or running[1] is not asyncio.current_task():
+                return
+            del self.__async_runs[key]
+            # A call that timed out, failed or was rejected says nothing about the
+            # value, so the next check runs the rule again
+            if error is None:
+                self.__memo_set(rule, value, result)
+            state.set((value, result))
+            await reactive.flush()
+
+    def __call_rule(self, name: str, rule: Rule, value):
+        memo_hit, result = self.__memo_get(rule, value)
+        if memo_hit:
+            return result
+        if not self.__timed:
+            result = rule.rule(value)
+        else:
+            start = time.perf_counter()
+            try:
+                result = rule.rule(value)
+            except Exception as e:
+                self.__record_rule(name, rule, time.perf_counter() - start, None, e)
+                raise
+            self.__record_rule(name, rule, time.perf_counter() - start, result)
+        self.__memo_set(rule, value, result)
+        return result
+
+    def __record_rule(self, name: str, rule: Rule, duration: float, result, error=None):
+        failed = error is not None or isinstance(result, (str, bytes))
+        if self.__adaptive_order:
+            stats = self.__rule_stats.get((name, rule))
+            if stats is None:
+                stats = self.__rule_stats[(name, rule)] = Stats()
+            stats.add(duration, failed, error is not None)
+        if self.__metrics is not None:
+            self.__metrics.record_rule(
+                rule.session.ns(name), rule.label, duration, failed=failed, error=error
+            )
+
+    def __ordered(self, name: str, rules: List[Rule]) -> List[Rule]:
+        # Each run of consecutive reorderable rules is sorted so that cheap rules
+        # that often fail run first; every other rule stays where it was added and
+        # acts as a barrier. The field still reports the first failure in the
+        # order the rules were added (see __run_rules).
+        if not any(rule.reorderable for rule in rules):
+            return rules
+        ordered = []
+        group = []
+        for rule in rules:
+            if rule.reorderable:
+                group.append(rule)
+                continue
+            ordered.extend(self.__sorted_group(name, group))
+            group = []
+            ordered.append(rule)
+        ordered.extend(self.__sorted_group(name, group))
+        return ordered
+
+    def __skipped_earlier(
+        self, rules: List[Rule], rule: Rule, remaining: List[Rule]
+    ) -> List[Rule]:
+        # The rules of `rule`'s reorderable group that were added before it and
+        # are still in `remaining`, in the order they were added
+        if not rule.reorderable:
+            return []
+        end = rules.index(rule)
+        start = end
+        while start > 0 and rules[start - 1].reorderable:
+            start -= 1
+        return [r for r in rules[start:end] if r in remaining]
+
+    def __sorted_group(self, name: str, group: List[Rule]) -> List[Rule]:
+        if len(group) < 2:
+            return group
+        if self.__adaptive_order:
+            stats = [self.__rule_stats.get((name, rule)) for rule in group]
+            if all(s is not None and s.calls >= adaptive_min_calls for s in stats):
+                # Expected time spent per failure found; rules that never
+                # failed go last, cheapest first.
+                ranks = {
+                    rule: (0, s.mean_time / s.failure_rate)
+                    if s.failures
+                    else (1, s.mean_time)
+                    for rule, s in zip(group, stats)
+                }
+                return sorted(group, key=ranks.get)
+        # Rules without a cost run after the others, in the order they were added
+        return sorted(
+            group, key=lambda rule: math.inf if rule.cost is None else rule.cost
+        )
+
+    def __memo_get(self, rule: Rule, value) -> Tuple[bool, object]:
+        if self.__memo is None or not rule.pure:
+            return False, None
+        try:
+            key = (rule, memo_key(value))
+        except TypeError:
+            return False, None
+        missing = object()
+        result = self.__memo.get(key, missing)
+        return result is not missing, result
+
+    def __memo_set(self, rule: Rule, value, result):
+        if self.__memo is None or not rule.pure:
+            return
+        try:
+            self.__memo.set((rule, memo_key(value)), result)
+        except TypeError:
+            pass
+
+    def __cancel_async(self, key):
+        running = self.__async_runs.pop(key, None)
+        if running is not None:
+            running[1].cancel()
+
+    def __cancel_remaining(self, name: str, rules: List[Rule]):
+        for rule in rules:
+            if rule.is_async:
+                self.__cancel_async((name, rule))
+
+
+def rule_result(name: str, result) -> Tuple[bool, Optional[dict]]:
+    # Turns a rule's return value into (stop, result): whether the field's rule
+    # chain stops here, and the validation result to report for the field.
+    result_is_html = isinstance(result, (str, bytes))
+    if result_is_html:
+        result = str(result)
+
+    is_valid_result = (
+        result is None or (isinstance(result, str)) or result == SkipValidation()
+    )
+
+    if not is_valid_result:
+        raise ValueError(
+            "Result of '"
+            + name
+            + "' validation was not a single-character vector (actual class: "
+            + str(type(result))
+            + ")"
+        )
+
+    if result is None:
+        return False, None
+    if result == SkipValidation():
+        return True, None
+    return True, {
+        "type": "error",
+        "message": result,
+        "is_html": result_is_html,
+    }
+
+
+def cross_messages(cross_rule: CrossRule, result) -> Dict[str, str]:
+    # A cross-field rule returns None, one message for all its targets, or a dict
+    # of target to message
+    if result is None:
+        return {}
+    if isinstance(result, (str, bytes)):
+        return {target: str(result) for target in cross_rule.targets}
+    if isinstance(result, Mapping):
+        unknown = [k for k in result if k not in cross_rule.targets]
+        if unknown:
+            raise ValueError(
+                f"Cross-field rule returned a message for '{unknown[0]}', "
+                "which is not one of its targets"
+            )
+        return {k: str(v) for k, v in result.items() if v is not None}
+    raise ValueError(
+        "Result of a cross-field rule must be None, a string or a dict (actual class: "
+        + str(type(result))
+        + ")"
+    )
+
+
+def same_value(a, b) -> bool:
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def client_decides(specs: List[dict], result: Optional[dict], value) -> bool:
+    # Whether the browser reaches the same result from the mirrored rules alone;
+    # any other result, such as an unexpected error, still has to be sent.
+    if not all(client_decides_value(spec, value) for spec in specs):
+        return False
+    if result is None:
+        return True
+    if result["type"] != "error":
+        return False
+    messages = set()
+    for spec in specs:
+        messages.update(
+            spec[k]
+            for k in ("message", "none_message", "zero_length_message")
+            if k in spec
+        )
+    return result["message"] in messages
+
+
+def is_exact_mirror(specs: List[Optional[dict]]) -> bool:
+    return all(
+        spec is not None and spec["name"] in exact_client_checks for spec in specs
+    )
 
-        for key in results:
-            if results[key] is True:
-                results[key] = None
 
-        return {**dependency_results, **results}
+def rule_label(rule: Callable) -> str:
+    spec = getattr(rule, "check_spec", None)
+    if spec is not None:
+        return "check." + spec["name"]
+    return getattr(rule, "__qualname__", None) or str(rule)
 
 
 def merge_results(self, resultsA: dict, resultsB: dict) -> dict:
@@ -234,7 +1180,9 @@ def input_provided(val):
     return True
 
 
-def timestamp_str(time=datetime.datetime.now()):
+def timestamp_str(time=None):
+    if time is None:
+        time = datetime.datetime.now()
     return time.strftime("%Y-%m-%d %H:%M:%S.%f")
 
 def get_running_loop():
@@ -8,6 +8,12 @@ interface Strategy {
 interface BSStrategy extends Strategy {
   isBS3: () => boolean;
   findInputContainer: (el: HTMLElement) => JQuery<HTMLElement> | null;
+  resolve: (el: HTMLElement) => BSElements | null;
+}
+
+interface BSElements {
+  container: JQuery<HTMLElement>;
+  control: JQuery<HTMLElement> | null;
 }
 
 /**
@@ -54,7 +60,7 @@ strategies.push(eventStrategy);
  * setInvalid/clearInvalid.
  */
 const bindingStrategy: Strategy = {
-  setInvalid: function(el, binding, data) {
+  setInvalid: function(el, binding, _id, data) {
     if (typeof(binding.setInvalid) !== "function") {
       return false;
     }
@@ -75,26 +81,56 @@ strategies.push(bindingStrategy);
  * This strategy detects .shiny-input-container at or above the el, and uses
  * Bootstrap 3 & 4 classes to display validation messages.
  */
+let bs3: boolean | null = null;
+
+// The .form-group and .form-control of each input element (null if it has no
+// .form-group), looked up once per binding
+const bsElements = new WeakMap<HTMLElement, BSElements | null>();
+
 const bsStrategy: BSStrategy = {
   isBS3: function() {
-    if (!$.fn.tab) {
-      return false;
+    if (bs3 === null) {
+      bs3 = Boolean($.fn.tab && $.fn.tab.Constructor.VERSION.match(/^3\./));
     }
-    return $.fn.tab.Constructor.VERSION.match(/^3\./);
+    return bs3;
   },
   findInputContainer: function(el) {
     el = $(el);
     const inputContainer = el.is(".form-group") ? el : el.parents(".form-group");
     return inputContainer.length === 0 ? null : inputContainer;
   },
-  setInvalid: function(el, data) {
-    if (data.type !== "error") {
+  resolve: function(el) {
+    if (!bsElements.has(el)) {
+      const container = this.findInputContainer(el);
+      let resolved = null;
+      if (container) {
+        const control = container.find(".form-control");
+        resolved = {
+          container: container,
+          control: control.length ? control : null,
+        };
+      }
+      bsElements.set(el, resolved);
+    }
+    return bsElements.get(el) || null;
+  },
+  setInvalid: function(el, binding, id, data) {
+    if (data.type !== "error" && data.type !== "pending") {
       return false;
     }
-    const inputContainer = this.findInputContainer(el);
-    if (!inputContainer) {
+    const resolved = this.resolve(el);
+    if (!resolved) {
       return false;
     }
+    const inputContainer = resolved.container;
+    if (data.type === "pending") {
+      // An async rule is still running: drop any stale error and mark the
+      // container as busy until the result arrives.
+      this.clearInvalid(el, binding, id, null);
+      inputContainer.addClass("shiny-validation-pending");
+      return true;
+    }
+    inputContainer.removeClass("shiny-validation-pending");
     if (this.isBS3()) {
       inputContainer.addClass("has-error");
     } else {
@@ -105,9 +141,8 @@ const bsStrategy: BSStrategy = {
       // (it conflicts with selectize CSS), so in the event that it's missing , 
       // we fallback to putting is-invalid on the container, which should be compatible 
       // with Selectize + BS4 https://github.com/rstudio/shiny/blob/2bd158a4/inst/www/shared/selectize/scss/selectize.bootstrap4.scss#L131-L140
-      const control = inputContainer.find(".form-control");
-      if (control.length) {
-        control.addClass("is-invalid");
+      if (resolved.control) {
+        resolved.control.addClass("is-invalid");
       } else {
         inputContainer.addClass("is-invalid");
       }
@@ -128,19 +163,18 @@ const bsStrategy: BSStrategy = {
     return true;
   },
   clearInvalid: function(el) {
-    const inputContainer = this.findInputContainer(el);
-    if (!inputContainer) {
+    const resolved = this.resolve(el);
+    if (!resolved) {
       return false;
     }
+    const inputContainer = resolved.container;
+    inputContainer.removeClass("shiny-validation-pending");
     if (this.isBS3()) {
       inputContainer.removeClass("has-error");
+    } else if (resolved.control) {
+      resolved.control.removeClass("is-invalid");
     } else {
-      const control = inputContainer.find(".form-control");
-      if (control.length) {
-        control.removeClass("is-invalid");
-      } else {
-        inputContainer.removeClass("is-invalid");
-      }
+      inputContainer.removeClass("is-invalid");
     }
     
     inputContainer.children(".shiny-validation-message").remove();
@@ -149,51 +183,410 @@ const bsStrategy: BSStrategy = {
 };
 strategies.push(bsStrategy);
 
-function setInvalid(el: HTMLElement, binding: any, id: string, data: any = null) {
+// The strategy that last handled each input, by "setInvalid:<id>" and
+// "clearInvalid:<id>". It is tried first; the others only if it declines.
+const strategyCache = new Map<string, Strategy>();
+
+function runStrategies(kind: "setInvalid" | "clearInvalid", el: HTMLElement, binding: any, id: string, data: any) {
+  const key = kind + ":" + id;
+  const cached = strategyCache.get(key);
+  if (cached && cached[kind](el, binding, id, data)) {
+    return true;
+  }
   for (var i = 0; i < strategies.length; i++) {
-    if (strategies[i].setInvalid(el, binding, id, data)) {
-      return;
+    if (strategies[i] !== cached && strategies[i][kind](el, binding, id, data)) {
+      strategyCache.set(key, strategies[i]);
+      return true;
     }
   }
+  return false;
+}
+
+function forgetInput(el: HTMLElement, id: string) {
+  strategyCache.delete("setInvalid:" + id);
+  strategyCache.delete("clearInvalid:" + id);
+  bsElements.delete(el);
+}
+
+function setInvalid(el: HTMLElement, binding: any, id: string, data: any = null) {
+  if (runStrategies("setInvalid", el, binding, id, data)) {
+    return;
+  }
   console.warn("Don't know how to display input validation feedback for input '" + id + "'. The message was:\n" + JSON.stringify(data));
 }
 
 function clearInvalid(el: HTMLElement, binding: any, id: string) {
-  for (var i = 0; i < strategies.length; i++) {
-    if (strategies[i].clearInvalid(el, binding, id, null)) {
+  if (runStrategies("clearInvalid", el, binding, id, null)) {
+    return;
+  }
+  console.warn("Don't know how to clear input validation feedback for input '" + id + "'");
+}
+
+type ClientRule = {name: string; message: string; [key: string]: any} | null;
+
+/**
+ * Built-in checks that the server mirrors to the browser (see `client_spec()` in
+ * check/_check.py), so that their messages show up as the user types. Each one
+ * returns the error message, null if the value passes, or undefined if only the
+ * server can tell. The server stays authoritative: its results replace these.
+ */
+const clientChecks: {[name: string]: (rule: any, value: any) => string | null | undefined} = {
+  required: function(rule, value) {
+    return value === null || value === undefined || value === "" ? rule.message : null;
+  },
+  integer: function(rule, value) {
+    if (value === null || value === undefined) {
+      return rule.allow_none ? null : rule.none_message;
+    }
+    if ((typeof value === "string" || Array.isArray(value)) && value.length === 0) {
+      return rule.zero_length_message;
+    }
+    return typeof value === "boolean" || Number.isInteger(value) ? null : rule.message;
+  },
+  between: function(rule, value) {
+    if (!isNumeric(value)) {
+      return undefined;
+    }
+    const x = +value;
+    const below = rule.inclusive[0] ? x < rule.left : x <= rule.left;
+    const above = rule.inclusive[1] ? x > rule.right : x >= rule.right;
+    return below || above ? rule.message : null;
+  },
+  in_set: function(rule, value) {
+    if (value !== null && typeof value === "object") {
+      return undefined;
+    }
+    if (typeof value === "boolean" && typeof rule.values[0] === "number") {
+      value = +value;
+    }
+    return rule.values.indexOf(value) < 0 ? rule.message : null;
+  },
+  pattern: function(rule, value) {
+    if (rule.allow_none && value === null) {
+      return null;
+    }
+    const re = compilePattern(rule.pattern, rule.ignore_case);
+    if (typeof value !== "string" || !re) {
+      return undefined;
+    }
+    const parts = rule.allow_multiple ? value.split(",").map((x) => x.trim()) : [value];
+    return parts.every((x) => re.test(x)) ? null : rule.message;
+  },
+  gt: comparison((x, rhs) => x > rhs),
+  gte: comparison((x, rhs) => x >= rhs),
+  lt: comparison((x, rhs) => x < rhs),
+  lte: comparison((x, rhs) => x <= rhs),
+  equal: comparison((x, rhs) => x === rhs, false),
+  not_equal: comparison((x, rhs) => x !== rhs, true),
+};
+
+function isNumeric(value: any): boolean {
+  return typeof value === "number" || typeof value === "boolean";
+}
+
+// `otherTypes` is the outcome for values that aren't numbers: unknown for
+// orderings, but equality with a number is always false in Python too.
+function comparison(test: (x: number, rhs: number) => boolean, otherTypes?: boolean) {
+  return function(rule: any, value: any): string | null | undefined {
+    if (value === null || value === undefined) {
+      return rule.allow_none ? null : rule.none_message;
+    }
+    let passes = otherTypes;
+    if (isNumeric(value)) {
+      passes = test(+value, rule.rhs);
+    }
+    if (passes === undefined) {
+      return undefined;
+    }
+    return passes ? null : rule.message;
+  };
+}
+
+const patternCache = new Map<string, RegExp | null>();
+
+function compilePattern(pattern: string, ignoreCase: boolean): RegExp | null {
+  const flags = ignoreCase ? "i" : "";
+  const key = flags + "/" + pattern;
+  if (!patternCache.has(key)) {
+    let re: RegExp | null = null;
+    try {
+      re = new RegExp(pattern, flags);
+    } catch {
+      // Python-only syntax: leave this rule to the server
+    }
+    patternCache.set(key, re);
+  }
+  return patternCache.get(key) || null;
+}
+
+function evaluateRules(rules: ClientRule[], value: any) {
+  for (const rule of rules) {
+    const check = rule && clientChecks[rule.name];
+    if (!rule || !check) {
+      return undefined;
+    }
+    const message = check(rule, value);
+    if (message === undefined) {
+      return undefined;
+    }
+    if (message !== null) {
+      return {type: "error", message: message, is_html: true};
+    }
+  }
+  return null;
+}
+
+// The mirrored rules and the last result received from the server, by input id
+const clientRules = new Map<string, ClientRule[]>();
+const serverResults = new Map<string, any>();
+let clientDeclared = false;
+
+function showResult(el: HTMLElement, binding: any, id: string, result: any) {
+  if (result === null) {
+    clearInvalid(el, binding, id);
+  } else {
+    setInvalid(el, binding, id, result);
+  }
+}
+
+function onInputChanged(evt: any) {
+  const rules = clientRules.get(evt.name);
+  if (!rules || !evt.el || !evt.binding) {
+    return;
+  }
+  let result = evaluateRules(rules, evt.value);
+  if (result === undefined) {
+    // Rules only the server can run decide: show its last word until it answers
+    if (!serverResults.has(evt.name)) {
       return;
     }
+    result = serverResults.get(evt.name);
   }
-  console.warn("Don't know how to clear input validation feedback for input '" + id + "'");
+  queueResult(evt.name, result);
 }
 
-function getBoundInputsMap() {
-  const results = new Map();
-  $(".shiny-bound-input").each(function(el) {
-    const binding = $(el).data("shiny-input-binding");
-    if (binding) {
-      const id = binding.getId(el);
-      results.set(id, {id: id, el: el, binding: binding});
+interface BoundInput {
+  id: string;
+  el: HTMLElement;
+  binding: any;
+}
+
+// Every bound input by id, kept up to date from Shiny's bind/unbind events
+// rather than by querying the whole document for each message
+let boundInputs: Map<string, BoundInput> | null = null;
+
+function getBoundInputsMap(): Map<string, BoundInput> {
+  if (boundInputs === null) {
+    // Inputs bound before this script loaded
+    boundInputs = new Map();
+    $(".shiny-bound-input").each(function(_i, el) {
+      const binding = $(el).data("shiny-input-binding");
+      if (binding) {
+        const id = binding.getId(el);
+        boundInputs!.set(id, {id: id, el: el, binding: binding});
+      }
+    });
+  }
+  return boundInputs;
+}
+
+function onBound(evt: any) {
+  if (evt.bindingType !== "input") {
+    return;
+  }
+  const id = evt.binding.getId(evt.target);
+  forgetInput(evt.target, id);
+  if (boundInputs !== null) {
+    boundInputs.set(id, {id: id, el: evt.target, binding: evt.binding});
+  }
+  // The server only sends fields whose state changed, so a re-rendered input
+  // (renderUI, insertUI) gets its last result back from here
+  if (serverResults.has(id)) {
+    queueResult(id, serverResults.get(id));
+  }
+  queueVisibilityCheck();
+}
+
+function onUnbound(evt: any) {
+  if (evt.bindingType !== "input") {
+    return;
+  }
+  const id = evt.binding.getId(evt.target);
+  forgetInput(evt.target, id);
+  const input = boundInputs && boundInputs.get(id);
+  if (input && input.el === evt.target) {
+    boundInputs!.delete(id);
+  }
+  queueVisibilityCheck();
+}
+
+// Results waiting for the next animation frame, by input id. Only the latest
+// result for an input is shown, and all of them in a single DOM pass.
+const pendingResults = new Map<string, any>();
+let frameRequested = false;
+
+function queueResult(id: string, result: any) {
+  pendingResults.set(id, result);
+  if (!frameRequested) {
+    frameRequested = true;
+    window.requestAnimationFrame(flushResults);
+  }
+}
+
+function flushResults() {
+  frameRequested = false;
+  const inputs = getBoundInputsMap();
+  for (const [id, result] of pendingResults) {
+    const input = inputs.get(id);
+    if (!input) {
+      console.warn("Couldn't perform validation update on input with id '" + id + "': input not found");
+      continue;
     }
-  });
+    showResult(input.el, input.binding, input.id, result);
+  }
+  pendingResults.clear();
+}
+
+// Tables of the compact result streams, one per validator. The server sends
+// each namespace prefix, field id and message once, then refers to it by index.
+interface CompactStream {
+  prefixes: string[];
+  fields: string[];
+  messages: any[];
+}
+
+const compactStreams = new Map<number, CompactStream>();
+
+function decodeCompact(message: any): Map<string, any> {
+  let stream = compactStreams.get(message.s);
+  if (message.r || !stream) {
+    stream = {prefixes: [], fields: [], messages: []};
+    compactStreams.set(message.s, stream);
+  }
+  for (const prefix of message.p || []) {
+    stream.prefixes.push(prefix);
+  }
+  const fields = message.f || [];
+  for (let i = 0; i < fields.length; i += 2) {
+    stream.fields.push(stream.prefixes[fields[i]] + fields[i + 1]);
+  }
+  for (const [type, text, isHtml] of message.m || []) {
+    stream.messages.push({type: type, message: text, is_html: isHtml});
+  }
+
+  const results = new Map<string, any>();
+  const errors = message.e || [];
+  for (let i = 0; i < errors.length; i += 2) {
+    results.set(stream.fields[errors[i]], stream.messages[errors[i + 1]]);
+  }
+  if (message.c) {
+    // Bit i of the bitset is set when field i was cleared
+    const bytes = atob(message.c);
+    for (let i = 0; i < bytes.length; i++) {
+      const byte = bytes.charCodeAt(i);
+      for (let bit = 0; bit < 8; bit++) {
+        if (byte & (1 << bit)) {
+          results.set(stream.fields[i * 8 + bit], null);
+        }
+      }
+    }
+  }
   return results;
 }
 
+function declareClient() {
+  if (!clientDeclared) {
+    // Lets the server skip results this script computes exactly, and send
+    // results in the compact format
+    clientDeclared = true;
+    Shiny.setInputValue("shinyvalidate_client", 2);
+  }
+}
+
+function receiveResult(id: string, result: any) {
+  serverResults.set(id, result);
+  queueResult(id, result);
+}
+
+// The ids of the bound inputs the user can't see (in an inactive tab, a collapsed
+// panel, a hidden conditionalPanel...), reported to the server once a validator
+// talks to this page, so that validators created with skip_hidden=True only
+// validate visible inputs
+let visibilityTracked = false;
+let visibilityRequested = false;
+let lastHidden: string | null = null;
+
+function isHidden(el: HTMLElement): boolean {
+  // Some bindings hide their own element (e.g. selectize), so the input's
+  // container decides
+  const container = $(el).closest(".shiny-input-container")[0] || el;
+  return container.getClientRects().length === 0;
+}
+
+function trackVisibility() {
+  if (!visibilityTracked) {
+    visibilityTracked = true;
+    queueVisibilityCheck();
+  }
+}
+
+function queueVisibilityCheck() {
+  if (!visibilityTracked || visibilityRequested) {
+    return;
+  }
+  visibilityRequested = true;
+  window.requestAnimationFrame(reportVisibility);
+}
+
+function reportVisibility() {
+  visibilityRequested = false;
+  const hidden: string[] = [];
+  for (const [id, input] of getBoundInputsMap()) {
+    if (isHidden(input.el)) {
+      hidden.push(id);
+    }
+  }
+  hidden.sort();
+  const key = JSON.stringify(hidden);
+  if (key !== lastHidden) {
+    lastHidden = key;
+    Shiny.setInputValue("shinyvalidate_hidden", hidden);
+  }
+}
+
 if (window.Shiny) {
-  Shiny.addCustomMessageHandler("validation-jcheng5", function(message) {
-    const boundInputsMap = getBoundInputsMap();
-    for (const [key, value] of Object.entries(message)) {
-      const input = boundInputsMap.get(key);
-      if (!input) {
-        console.warn("Couldn't perform validation update on input with id '" + key + "': input not found");
-        continue;
-      }
-      
-      if (value === null) {
-        clearInvalid(input.el, input.binding, input.id);
+  $(document).on("shiny:inputchanged", onInputChanged);
+  $(document).on("shiny:bound", onBound);
+  $(document).on("shiny:unbound", onUnbound);
+  // conditionalPanel and Bootstrap 3 trigger jQuery events; Bootstrap 5 native ones
+  $(document).on("shown hidden", queueVisibilityCheck);
+  for (const type of ["shown.bs.tab", "hidden.bs.tab", "shown.bs.collapse", "hidden.bs.collapse"]) {
+    document.addEventListener(type, queueVisibilityCheck);
+  }
+
+  Shiny.addCustomMessageHandler("validation-rules-jcheng5", function(message) {
+    for (const [key, rules] of Object.entries(message)) {
+      if (rules === null) {
+        clientRules.delete(key);
       } else {
-        setInvalid(input.el, input.binding, input.id, value);
+        clientRules.set(key, rules as ClientRule[]);
       }
     }
+    declareClient();
+  });
+
+  Shiny.addCustomMessageHandler("validation-jcheng5", function(message) {
+    for (const [key, value] of Object.entries(message)) {
+      receiveResult(key, value);
+    }
+    declareClient();
+    trackVisibility();
+  });
+
+  Shiny.addCustomMessageHandler("validation-compact-jcheng5", function(message) {
+    for (const [key, value] of decodeCompact(message)) {
+      receiveResult(key, value);
+    }
+    trackVisibility();
   });
 }
@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+from shiny import reactive
+from shiny.session import session_context
+
+from shiny_validate._testing import RecordingSession, set_input
+
+__all__ = ["flush", "set_input"]
+
+
+async def flush(seconds: float = 0):
+    await reactive.flush()
+    if seconds:
+        await asyncio.sleep(seconds)
+        await reactive.flush()
+
+
+@pytest.fixture
+def session():
+    session = RecordingSession()
+    with session_context(session):
+        yield session
@@ -0,0 +1,34 @@
+import asyncio
+
+from conftest import flush, set_input
+
+from shiny_validate import InputValidator
+
+calls = []
+
+
+async def slow_once(value):
+    calls.append(value)
+    if len(calls) == 1:
+        await asyncio.sleep(1)
+    return "Taken" if value == "bob" else None
+
+
+def test_timed_out_calls_are_not_memoized(session):
+    async def main():
+        calls.clear()
+        set_input(session, "name", "bob")
+        iv = InputValidator(memoize=True)
+        iv.add_rule("name", slow_once, timeout=0.05)
+        iv.enable()
+        await flush(0.2)
+        assert session.results()["name"]["message"] == "Validation timed out"
+
+        set_input(session, "name", "alice")
+        await flush(0.1)
+        set_input(session, "name", "bob")
+        await flush(0.1)
+        assert calls == ["bob", "alice", "bob"]
+        assert session.results()["name"]["message"] == "Taken"
+
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import pytest
+
+from shiny_validate import check, validate_columns
+from shiny_validate.batch import validate_rows
+
+nan = float("nan")
+
+columns = {
+    "ints": [0, 5, 10, 11, -1],
+    "floats": [0.5, nan, 10.0, 10.5, -0.0],
+    "bools": [True, False, True],
+    "strings": ["", "a", "1", "x@example.com", "https://example.com", "A"],
+    "mixed": [1, "1", None, 2.5, True, "", nan, "a", 2],
+    "empty": [],
+}
+
+rules = {
+    "required": check.required(),
+    "between": check.between(0, 10, [True, False]),
+    "in_set numbers": check.in_set({1, 2, 2.5}),
+    "in_set mixed": check.in_set({1, "2", "a"}),
+    "regex": check.regex("^[a-z]+$", "Lowercase only", ignore_case=True),
+    "email": check.email(),
+    "url": check.url(allow_none=True),
+    "integer": check.integer(),
+}
+
+
+@pytest.mark.parametrize("column", list(columns))
+@pytest.mark.parametrize("rule", list(rules))
+def test_vectorized_matches_scalar(column, rule):
+    values = columns[column]
+    result = validate_columns({"c": values}, {"c": [rules[rule]]})
+    assert result.errors["c"] == validate_rows(values, [rules[rule]])
+
+
+def test_in_set_with_mixed_types_compares_values_as_is():
+    result = validate_columns({"c": [1, 2, 3]}, {"c": check.in_set({1, "2"})})
+    assert [msg is None for msg in result.errors["c"]] == [True, False, False]
+
+
+def test_rule_chain_stops_at_first_failure():
+    data = {"age": [30, None, 200, 4.5], "code": ["A", "B", "A", None]}
+    result = validate_columns(
+        data,
+        {
+            "age": [
+                check.required(),
+                check.integer(),
+                check.between(0, 120, [True, True]),
+            ],
+            "code": [check.required(), lambda x: "Not A" if x != "A" else None],
+        },
+    )
+    assert result.errors["age"] == [
+        None,
+        "Required",
+        "Must be between 0 and 120.",
+        "An integer is required",
+    ]
+    assert result.errors["code"] == [None, "Not A", None, "Required"]
+    assert result.counts == {"age": 3, "code": 2}
+    assert result.invalid_rows() == [1, 2, 3]
+    assert result.row_errors(3) == {"age": "An integer is required", "code": "Required"}
+
+
+def test_async_rules_are_rejected():
+    async def rule(value):
+        return None
+
+    with pytest.raises(ValueError):
+        validate_columns({"c": [1, 2]}, {"c": rule})
@@ -0,0 +1,40 @@
+import asyncio
+
+from conftest import flush, set_input
+
+from shiny_validate import InputValidator, check
+
+in_set_error = {
+    "type": "error",
+    "message": "Must be in the set of a, b.",
+    "is_html": True,
+}
+
+
+def test_server_sends_results_the_browser_cannot_decide(session):
+    async def main():
+        set_input(session, "shinyvalidate_client", 1)
+        set_input(session, "pick", "z")
+        iv = InputValidator()
+        iv.add_rule("pick", check.in_set(["a", "b"]))
+        iv.enable()
+        await flush()
+        assert session.results() == {"pick": in_set_error}
+
+        # The browser computes results for scalar values itself
+        set_input(session, "pick", "a")
+        await flush()
+        sent = len(session.sent)
+        set_input(session, "pick", "q")
+        await flush()
+        assert len(session.sent) == sent
+
+        # but not for lists, so the server must send its result
+        set_input(session, "pick", "a")
+        await flush()
+        sent = len(session.sent)
+        set_input(session, "pick", ["a", "q"])
+        await flush()
+        assert session.sent[sent:] == [("validation-jcheng5", {"pick": in_set_error})]
+
+    asyncio.run(main())
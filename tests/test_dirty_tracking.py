@@ -0,0 +1,64 @@
+import asyncio
+
+from conftest import flush, set_input
+from shiny import reactive
+
+from shiny_validate import InputValidator, check
+
+mismatch = {"type": "error", "message": "Passwords do not match", "is_html": True}
+
+
+def test_rules_reading_other_inputs_see_their_changes(session):
+    async def main():
+        set_input(session, "pw1", "secret")
+        set_input(session, "pw2", "secret")
+        iv = InputValidator(track_dirty=True)
+        iv.add_rule("pw1", check.required())
+        iv.add_rule(
+            "pw2",
+            lambda x: "Passwords do not match" if x != session.input.pw1() else None,
+            pure=False,
+        )
+        iv.enable()
+        await flush()
+        assert session.results() == {}
+
+        # Only pw1 changes, but pw2's result depends on it
+        set_input(session, "pw1", "changed")
+        await flush()
+        assert session.results() == {"pw2": mismatch}
+        with reactive.isolate():
+            assert not iv.is_valid()
+        assert iv.dirty_fields() == ["pw1"]
+
+        set_input(session, "pw2", "changed")
+        await flush()
+        assert session.results() == {}
+        with reactive.isolate():
+            assert iv.is_valid()
+
+    asyncio.run(main())
+
+
+def test_clean_fields_reuse_their_result(session):
+    calls = []
+
+    def rule(value):
+        calls.append(value)
+
+    async def main():
+        set_input(session, "a", "x")
+        set_input(session, "b", "y")
+        iv = InputValidator(track_dirty=True)
+        iv.add_rule("a", rule)
+        iv.add_rule("b", check.required())
+        iv.enable()
+        await flush()
+        calls.clear()
+
+        set_input(session, "b", "z")
+        await flush()
+        assert calls == []
+        assert iv.dirty_fields() == ["b"]
+
+    asyncio.run(main())
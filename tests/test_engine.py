@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from conftest import set_input
+from shiny import reactive
+
+from shiny_validate import InputValidator, ValidationEngine, check
+
+err = {"type": "error", "is_html": True}
+
+
+def failing(message):
+    return dict(err, message=message)
+
+
+def make_engine() -> ValidationEngine:
+    engine = ValidationEngine()
+    engine.add_rule("name", check.required())
+    engine.add_rule("name", lambda x: "Too long" if len(x) > 5 else None)
+    engine.add_rule("age", check.integer(allow_none=True))
+    return engine
+
+
+def test_first_failing_rule_wins():
+    engine = make_engine()
+    assert engine.validate({"name": "", "age": 3}) == {
+        "name": failing("Required"),
+        "age": None,
+    }
+    assert engine.errors({"name": "Bartholomew", "age": "x"}) == {
+        "name": "Too long",
+        "age": "An integer is required",
+    }
+    assert engine.is_valid({"name": "Bob"})
+    assert list(engine.validate_many([{"name": "Bob"}, {}])) == [
+        {"name": None, "age": None},
+        {"name": failing("Required"), "age": None},
+    ]
+
+
+def test_rule_errors_become_messages():
+    engine = ValidationEngine()
+    engine.add_rule("x", lambda x: 1 / x)
+    assert engine.errors({"x": 0}) == {
+        "x": "An unexpected error occurred during input validation: division by zero"
+    }
+
+
+def test_children_and_conditions():
+    engine = make_engine()
+    address = ValidationEngine()
+    address.add_rule("street", check.required())
+    shipping = ValidationEngine()
+    shipping.condition(lambda data: data.get("ship"))
+    shipping.add_rule("zip", check.required())
+    engine.add_validator(address, "address")
+    engine.add_validator(shipping, "shipping")
+
+    data = {"name": "Bob"}
+    assert engine.errors(data) == {"street": "Required"}
+    assert engine.errors(dict(data, ship=True)) == {
+        "street": "Required",
+        "zip": "Required",
+    }
+
+    # Rules added to a child after validating are picked up by its parents
+    address.add_rule("city", check.required())
+    assert engine.errors(dict(data, street="Main St")) == {"city": "Required"}
+
+    engine.condition(lambda data: False)
+    assert engine.validate(data) == {
+        "zip": None,
+        "street": None,
+        "city": None,
+        "name": None,
+        "age": None,
+    }
+
+
+def test_async_rules_need_validate_async():
+    async def is_free(value):
+        await asyncio.sleep(0)
+        return "Taken" if value == "bob" else None
+
+    engine = ValidationEngine()
+    engine.add_rule("name", is_free)
+    with pytest.raises(ValueError):
+        engine.validate({"name": "bob"})
+    assert asyncio.run(engine.validate_async({"name": "bob"})) == {
+        "name": failing("Taken")
+    }
+
+
+def test_to_engine_matches_the_validator(session):
+    set_input(session, "name", "Bartholomew")
+    set_input(session, "age", "x")
+    iv = InputValidator()
+    iv.add_rule("name", check.required())
+    iv.add_rule("name", lambda x: "Too long" if len(x) > 5 else None)
+    child = InputValidator()
+    child.add_rule("age", check.integer())
+    iv.add_validator(child)
+
+    with reactive.isolate():
+        expected = iv.validate()
+    engine = iv.to_engine()
+    assert engine.validate({"name": "Bartholomew", "age": "x"}) == expected
@@ -0,0 +1,57 @@
+import asyncio
+
+from conftest import flush, set_input
+
+from shiny_validate import InputValidator, check
+
+required = {"type": "error", "message": "Required", "is_html": True}
+
+
+def test_fields_skipped_by_a_child_are_not_cleared(session):
+    async def main():
+        set_input(session, "a", "")
+        set_input(session, "b", "")
+        set_input(session, "shinyvalidate_hidden", [])
+        iv = InputValidator()
+        iv.add_rule("a", lambda value: None if value else "Required")
+        child = InputValidator(skip_hidden=True)
+        child.add_rule("b", lambda value: None if value else "Required")
+        iv.add_validator(child, "child")
+        iv.enable()
+        await flush()
+        assert session.results() == {"a": required, "b": required}
+
+        # "b" is hidden: the child skips it, and its message stays as it was
+        set_input(session, "shinyvalidate_hidden", ["b"])
+        set_input(session, "a", "x")
+        await flush()
+        assert session.results() == {"b": required}
+
+        # Once shown again, it is validated with its current value
+        set_input(session, "b", "y")
+        await flush()
+        assert session.results() == {"b": required}
+        set_input(session, "shinyvalidate_hidden", [])
+        await flush()
+        assert session.results() == {}
+
+    asyncio.run(main())
+
+
+def test_parent_skipping_hidden_fields_applies_to_children(session):
+    async def main():
+        set_input(session, "b", "")
+        set_input(session, "shinyvalidate_hidden", ["b"])
+        iv = InputValidator(skip_hidden=True)
+        child = InputValidator()
+        child.add_rule("b", check.required())
+        iv.add_validator(child, "child")
+        iv.enable()
+        await flush()
+        assert session.results() == {}
+
+        set_input(session, "shinyvalidate_hidden", [])
+        await flush()
+        assert session.results() == {"b": required}
+
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+
+from conftest import flush, set_input
+
+from shiny_validate import InputValidator, ValidationMetrics, check
+
+
+def failing_exporter(event):
+    raise RuntimeError("exporter is down")
+
+
+def test_exporter_errors_are_logged_and_ignored(caplog):
+    metrics = ValidationMetrics(exporter=failing_exporter)
+    with caplog.at_level(logging.ERROR, logger="shiny_validate.metrics"):
+        metrics.record_rule("name", "required", 0.01, True)
+        metrics.record_field("name", 0.01, True)
+
+    assert metrics.rules[("name", "required")].calls == 1
+    assert metrics.fields["name"].failures == 1
+    assert len(caplog.records) == 2
+    assert "exporter is down" in caplog.text
+
+
+def test_failing_exporter_does_not_affect_validation(session, caplog):
+    async def main():
+        set_input(session, "name", "")
+        set_input(session, "age", "42")
+        iv = InputValidator(metrics=ValidationMetrics(exporter=failing_exporter))
+        iv.add_rule("name", check.required())
+        iv.add_rule("age", check.required())
+        iv.enable()
+        await flush()
+
+        assert session.results() == {
+            "name": {"type": "error", "message": "Required", "is_html": True}
+        }
+        set_input(session, "name", "Ada")
+        await flush()
+        assert session.results() == {}
+
+    with caplog.at_level(logging.ERROR, logger="shiny_validate.metrics"):
+        asyncio.run(main())
+    assert "exporter is down" in caplog.text
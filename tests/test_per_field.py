@@ -0,0 +1,33 @@
+import asyncio
+
+from conftest import flush, set_input
+
+from shiny_validate import InputValidator
+
+
+def test_child_validators_follow_per_field(session):
+    calls = []
+
+    def counting(label):
+        def rule(value):
+            calls.append(label)
+
+        return rule
+
+    async def main():
+        set_input(session, "a", "x")
+        set_input(session, "b", "y")
+        iv = InputValidator(per_field=True)
+        child = InputValidator()
+        child.add_rule("a", counting("a"))
+        child.add_rule("b", counting("b"))
+        iv.add_validator(child, "child")
+        iv.enable()
+        await flush()
+        calls.clear()
+
+        set_input(session, "a", "z")
+        await flush()
+        assert calls == ["a"]
+
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+import pytest
+
+from shiny_validate import RuleCache
+
+calls = []
+
+
+def test_lambdas_and_closures_need_a_key():
+    cache = RuleCache()
+    with pytest.raises(ValueError):
+        cache.rule(lambda value: None)
+
+    def per_session(taken):
+        def is_free(value):
+            return "Taken" if value in taken else None
+
+        return is_free
+
+    with pytest.raises(ValueError):
+        cache.rule(per_session({"bob"}))
+
+    alice = cache.rule(per_session({"alice"}), key="alice")
+    bob = cache.rule(per_session({"bob"}), key="bob")
+    assert alice("alice") == "Taken" and alice("bob") is None
+    assert bob("alice") is None and bob("bob") == "Taken"
+
+
+def test_same_function_shares_results():
+    cache = RuleCache()
+    calls.clear()
+
+    def make():
+        def is_free(value):
+            calls.append(value)
+
+        return cache.rule(is_free)
+
+    first, second = make(), make()
+    first("bob")
+    second("bob")
+    assert calls == ["bob"]
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,73 @@
+import asyncio
+
+from conftest import flush, set_input
+from shiny import reactive
+
+from shiny_validate import InputValidator
+
+
+def error(message):
+    return {"type": "error", "message": message, "is_html": True}
+
+
+def recording_rule(calls, label, message):
+    def rule(value):
+        calls.append(label)
+        return message
+
+    return rule
+
+
+def test_first_added_failure_wins_when_both_fail(session):
+    calls = []
+
+    async def main():
+        set_input(session, "name", "x")
+        iv = InputValidator()
+        iv.add_rule("name", recording_rule(calls, "slow", "Slow failed"), cost=50)
+        iv.add_rule("name", recording_rule(calls, "fast", "Fast failed"), cost=1)
+        iv.enable()
+        await flush()
+
+        # The cheap rule runs first, but the rule added first decides
+        assert calls == ["fast", "slow"]
+        assert session.results() == {"name": error("Slow failed")}
+        with reactive.isolate():
+            assert iv.validate() == {"name": error("Slow failed")}
+
+    asyncio.run(main())
+
+
+def test_reordered_failure_reported_when_earlier_rules_pass(session):
+    calls = []
+
+    async def main():
+        set_input(session, "name", "x")
+        iv = InputValidator()
+        iv.add_rule("name", recording_rule(calls, "slow", None), cost=50)
+        iv.add_rule("name", recording_rule(calls, "fast", "Fast failed"), cost=1)
+        iv.add_rule("name", recording_rule(calls, "last", "Last failed"), cost=10)
+        iv.enable()
+        await flush()
+
+        # Rules added after the failing one are still skipped
+        assert calls == ["fast", "slow"]
+        assert session.results() == {"name": error("Fast failed")}
+
+    asyncio.run(main())
+
+
+def test_adaptive_order_keeps_first_added_failure(session):
+    async def main():
+        set_input(session, "name", 0)
+        iv = InputValidator(adaptive_order=True)
+        iv.add_rule("name", lambda v: "Odd" if v % 2 else None, reorderable=True)
+        iv.add_rule("name", lambda v: "Positive", reorderable=True)
+        iv.enable()
+        for i in range(1, 50):
+            set_input(session, "name", i)
+            await flush()
+            expected = "Odd" if i % 2 else "Positive"
+            assert session.results() == {"name": error(expected)}
+
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+import itertools
+
+import pytest
+
+from shiny_validate import check
+from shiny_validate.check import ValueIndex
+
+values = ["", "a", "ab", "abc", "abd", "b", "ba", "z", "é", "éa", "日本", "😀"]
+bounds = [None, "", "a", "aa", "ab", "abz", "b", "c", "é", "😀", "😀😀"]
+
+
+def utf8(value: str) -> bytes:
+    return value.encode("utf-8")
+
+
+def test_values_are_sorted_by_utf8_bytes():
+    index = ValueIndex.from_values(reversed(values + ["a", "b"]))
+    assert list(index) == sorted(values, key=utf8)
+    assert len(index) == len(values)
+    assert index[0] == "" and index[-1] == "😀"
+    with pytest.raises(IndexError):
+        index[len(values)]
+
+
+def test_contains_bisects_every_position():
+    index = ValueIndex.from_values(values)
+    for value in values:
+        assert value in index
+    for value in ["0", "aa", "abcd", "bb", "é́", "\U0010ffff", 1, None]:
+        assert value not in index
+    assert not ValueIndex.from_values([]).contains("a")
+
+
+@pytest.mark.parametrize("prefix", ["", "a", "ab", "abc", "abz", "é", "x"])
+def test_prefix(prefix):
+    index = ValueIndex.from_values(values)
+    expected = sorted((v for v in values if v.startswith(prefix)), key=utf8)
+    assert list(index.prefix(prefix)) == expected
+    assert list(index.prefix(prefix, limit=2)) == expected[:2]
+
+
+@pytest.mark.parametrize("low,high", list(itertools.product(bounds, bounds)))
+def test_range_bounds(low, high):
+    index = ValueIndex.from_values(values)
+    for inclusive in [(True, True), (True, False), (False, True), (False, False)]:
+
+        def within(v, inclusive=inclusive):
+            if low is not None:
+                if utf8(v) < utf8(low) or (not inclusive[0] and v == low):
+                    return False
+            if high is not None:
+                if utf8(v) > utf8(high) or (not inclusive[1] and v == high):
+                    return False
+            return True
+
+        expected = [v for v in sorted(values, key=utf8) if within(v)]
+        assert list(index.range(low, high, inclusive)) == expected
+
+
+def test_build_and_open_share_one_index(tmp_path):
+    path = tmp_path / "names.idx"
+    index = ValueIndex.build(["bob", "alice"], path)
+    assert ValueIndex.open(path) is index
+    assert ValueIndex.open(str(path)) is index
+
+    rebuilt = ValueIndex.build(["carol"], path)
+    assert rebuilt is not index and list(rebuilt) == ["carol"]
+    assert ValueIndex.open(path) is rebuilt
+    rebuilt.close()
+    index.close()
+
+    with pytest.raises(ValueError):
+        ValueIndex(b"not an index file")
+
+
+def test_in_index_rule():
+    rule = check.in_index(ValueIndex.from_values(["b", "a", "c", "d"]))
+    assert rule("c") is None
+    assert rule("e") == "Must be in the set of a, b, c (and 1 more)."
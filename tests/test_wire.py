@@ -0,0 +1,79 @@
+import base64
+
+from shiny_validate import _wire
+from shiny_validate._wire import CompactEncoder, bitset
+
+
+class Decoder:
+    """
+    The browser's side of "validation-compact-jcheng5" (`decodeCompact()`).
+    """
+
+    def __init__(self):
+        self.streams = {}
+
+    def decode(self, message: dict) -> dict:
+        stream = self.streams.get(message["s"])
+        if message.get("r") or stream is None:
+            stream = self.streams[message["s"]] = ([], [], [])
+        prefixes, fields, messages = stream
+        prefixes.extend(message.get("p", []))
+        new_fields = message.get("f", [])
+        for i in range(0, len(new_fields), 2):
+            fields.append(prefixes[new_fields[i]] + new_fields[i + 1])
+        for type, text, is_html in message.get("m", []):
+            messages.append({"type": type, "message": text, "is_html": is_html})
+
+        results = {}
+        errors = message.get("e", [])
+        for i in range(0, len(errors), 2):
+            results[fields[errors[i]]] = messages[errors[i + 1]]
+        for i, byte in enumerate(base64.b64decode(message.get("c", ""))):
+            for bit in range(8):
+                if byte & (1 << bit):
+                    results[fields[i * 8 + bit]] = None
+        return results
+
+
+def error(message: str) -> dict:
+    return {"type": "error", "message": message, "is_html": False}
+
+
+def test_bitset():
+    assert base64.b64decode(bitset([0])) == b"\x01"
+    assert base64.b64decode(bitset([7, 8])) == b"\x80\x01"
+    assert base64.b64decode(bitset([3, 17, 3])) == b"\x08\x00\x02"
+
+
+def test_round_trip_and_tables_are_sent_once():
+    encoder = CompactEncoder()
+    decoder = Decoder()
+    changes = [
+        {"name": error("Required"), "mod-name": error("Required"), "mod-age": None},
+        {"name": None, "mod-age": error("Required"), "mod-x-y": error("Too long")},
+        {"name": error("Required"), "mod-name": None},
+        {},
+    ]
+    for i, change in enumerate(changes):
+        encoded = encoder.encode(change)
+        assert decoder.decode(encoded) == change
+        assert ("r" in encoded) == (i == 0)
+
+    assert CompactEncoder().encode({"name": None})["s"] != encoder.stream
+    # Known prefixes and messages are referred to by index
+    encoded = encoder.encode({"mod-zip": error("Too long"), "other-a": error("Bad")})
+    assert encoded["p"] == ["other-"]
+    assert encoded["f"] == [1, "zip", 3, "a"]
+    assert encoded["m"] == [["error", "Bad", False]]
+
+
+def test_tables_reset_when_full(monkeypatch):
+    monkeypatch.setattr(_wire, "max_messages", 3)
+    encoder = CompactEncoder()
+    decoder = Decoder()
+    for i in range(10):
+        change = {"name": error(f"Message {i}"), "other": None}
+        encoded = encoder.encode(change)
+        assert decoder.decode(encoded) == change
+        assert len(encoded["m"]) == 1
+        assert ("r" in encoded) == (i % 4 == 0)